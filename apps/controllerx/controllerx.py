@@ -4,6 +4,9 @@ Create controller-based automations with ease to control your home devices and s
 https://github.com/xaviml/controllerx
 """
 
+import importlib
+from typing import Any
+
 from cx_core import (
     Controller,
     CoverController,
@@ -13,28 +16,21 @@ from cx_core import (
     SwitchController,
     Z2MLightController,
 )
-from cx_devices.adeo import *
-from cx_devices.aqara import *
-from cx_devices.aurora import *
-from cx_devices.homematic import *
-from cx_devices.ikea import *
-from cx_devices.legrand import *
-from cx_devices.linkind import *
-from cx_devices.livarno import *
-from cx_devices.lutron import *
-from cx_devices.muller_licht import *
-from cx_devices.namron import *
-from cx_devices.osram import *
-from cx_devices.philips import *
-from cx_devices.prolight import *
-from cx_devices.rgb_genie import *
-from cx_devices.robb import *
-from cx_devices.sengled import *
-from cx_devices.shelly import *
-from cx_devices.smartkontakten import *
-from cx_devices.smartthings import *
-from cx_devices.sonoff import *
-from cx_devices.tasmota import *
-from cx_devices.terncy import *
-from cx_devices.trust import *
-from cx_devices.tuya import *
+from cx_devices.index import DEVICES_INDEX
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Device classes are imported when AppDaemon looks them up, so only the
+    modules from the devices in use are loaded.
+    """
+    if name not in DEVICES_INDEX:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"cx_devices.{DEVICES_INDEX[name]}")
+    device_class = getattr(module, name)
+    globals()[name] = device_class
+    return device_class
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(DEVICES_INDEX))
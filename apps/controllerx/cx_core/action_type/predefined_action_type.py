@@ -1,4 +1,5 @@
 import inspect
+from dataclasses import dataclass
 from typing import Any
 
 from cx_const import (
@@ -19,12 +20,30 @@ def _get_action(action_value: TypeAction) -> ActionFunctionWithParams:
         return (action_value, tuple())
 
 
-def _get_arguments(
+@dataclass
+class _BoundAction:
+    action: ActionFunction
+    positional: ActionParams
+    kwargs: dict[str, Any]
+    with_extra: bool
+
+    def get_arguments(
+        self, extra: EventData | None
+    ) -> tuple[ActionParams, dict[str, Any]]:
+        if self.with_extra:
+            return self.positional, {**self.kwargs, "extra": extra}
+        return self.positional, self.kwargs
+
+
+def _bind_action(
     action: ActionFunction,
     args: ActionParams,
     predefined_action_kwargs: dict[str, Any],
-    extra: EventData | None,
-) -> tuple[ActionParams, dict[str, Any]]:
+) -> _BoundAction:
+    """
+    It resolves the arguments that will be passed to the action, except for `extra`,
+    which is only known when the action is called.
+    """
     action_parameters = inspect.signature(action).parameters
     action_parameters_without_extra = {
         key: param for key, param in action_parameters.items() if key != "extra"
@@ -39,7 +58,8 @@ def _get_arguments(
     )  # ControllerX args
     action_positional_args = set(action_args.keys())
     action_args.update(predefined_action_kwargs)  # User args
-    action_args.update({"extra": extra} if "extra" in action_parameters else {})
+    with_extra = "extra" in action_parameters
+    action_args.update({"extra": None} if with_extra else {})
     action_args = {
         key: value for key, value in action_args.items() if key in action_parameters
     }
@@ -68,15 +88,18 @@ def _get_arguments(
     action_args = {
         key: value
         for key, value in action_args.items()
-        if key not in action_positional_args
+        if key not in action_positional_args and key != "extra"
     }
-    return positional, action_args
+    return _BoundAction(action, positional, action_args, with_extra)
 
 
 class PredefinedActionType(ActionType):
     predefined_action_key: str
     predefined_action_kwargs: dict[str, Any]
     predefined_actions_mapping: PredefinedActionsMapping
+    # Arguments are resolved once per action key, since neither the predefined
+    # actions nor the user arguments change after initialization.
+    _bound_actions: dict[str, _BoundAction]
 
     def _raise_action_key_not_found(
         self, predefined_action_key: str, predefined_actions: PredefinedActionsMapping
@@ -97,25 +120,27 @@ class PredefinedActionType(ActionType):
             raise ValueError(
                 f"Cannot use predefined actions for `{self.controller.__class__.__name__}` class."
             )
-        if (
-            not self.controller.contains_templating(self.predefined_action_key)
-            and self.predefined_action_key not in self.predefined_actions_mapping
-        ):
-            self._raise_action_key_not_found(
-                self.predefined_action_key, self.predefined_actions_mapping
-            )
+        self._bound_actions = {}
+        if not self.controller.contains_templating(self.predefined_action_key):
+            self._get_bound_action(self.predefined_action_key)
+
+    def _get_bound_action(self, action_key: str) -> _BoundAction:
+        bound_action = self._bound_actions.get(action_key)
+        if bound_action is None:
+            if action_key not in self.predefined_actions_mapping:
+                self._raise_action_key_not_found(
+                    action_key, self.predefined_actions_mapping
+                )
+            action, args = _get_action(self.predefined_actions_mapping[action_key])
+            bound_action = _bind_action(action, args, self.predefined_action_kwargs)
+            self._bound_actions[action_key] = bound_action
+        return bound_action
 
     async def run(self, extra: EventData | None = None) -> None:
         action_key = await self.controller.render_value(self.predefined_action_key)
-        if action_key not in self.predefined_actions_mapping:
-            self._raise_action_key_not_found(
-                action_key, self.predefined_actions_mapping
-            )
-        action, args = _get_action(self.predefined_actions_mapping[action_key])
-        positional, action_args = _get_arguments(
-            action, args, self.predefined_action_kwargs, extra
-        )
-        await action(*positional, **action_args)
+        bound_action = self._get_bound_action(action_key)
+        positional, action_args = bound_action.get_arguments(extra)
+        await bound_action.action(*positional, **action_args)
 
     def __str__(self) -> str:
         return f"Predefined ({self.predefined_action_key})"
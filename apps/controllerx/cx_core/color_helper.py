@@ -1,5 +1,11 @@
+from array import array
+from functools import lru_cache
+from typing import Any
+
 Color = tuple[float, float]
 Colors = list[Color]
+# Red, green and blue vertices of the colors a light can reproduce
+Gamut = tuple[Color, Color, Color]
 
 # These are the 24 colors that appear in the circle color of home assistant
 default_color_wheel = [
@@ -79,3 +85,127 @@ def get_color_wheel(colors: str | Colors) -> Colors:
         raise ValueError(
             f"Type {type(colors)} is not supported for `color_wheel` attribute"
         )
+
+
+def get_color_gamut(gamut: Any) -> Gamut | None:
+    if gamut is None:
+        return None
+    if (
+        isinstance(gamut, (list, tuple))
+        and len(gamut) == 3
+        and all(
+            isinstance(color, (list, tuple))
+            and len(color) == 2
+            and all(isinstance(value, (int, float)) for value in color)
+            for color in gamut
+        )
+    ):
+        red, green, blue = ((x, y) for x, y in gamut)
+        return (red, green, blue)
+    raise ValueError(
+        "`color_gamut` must be a list with the xy colors of the red, green and "
+        f"blue vertices (e.g. [[0.692, 0.308], [0.17, 0.7], [0.153, 0.048]]), got {gamut}"
+    )
+
+
+def _closest_point_in_segment(point: Color, start: Color, end: Color) -> Color:
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    length = dx * dx + dy * dy
+    if length == 0:
+        return start
+    t = ((point[0] - start[0]) * dx + (point[1] - start[1]) * dy) / length
+    t = max(0.0, min(t, 1.0))
+    return (start[0] + t * dx, start[1] + t * dy)
+
+
+def clip_to_gamut(color: Color, gamut: Gamut) -> Color:
+    """
+    It returns the color if it is inside the gamut triangle,
+    otherwise the closest color in the edges of the triangle.
+    """
+    x, y = color
+    signs = [
+        (x2 - x1) * (y - y1) - (y2 - y1) * (x - x1) >= 0
+        for (x1, y1), (x2, y2) in zip(gamut, gamut[1:] + gamut[:1])
+    ]
+    if all(signs) or not any(signs):
+        return color
+    candidates = [
+        _closest_point_in_segment(color, start, end)
+        for start, end in zip(gamut, gamut[1:] + gamut[:1])
+    ]
+    return min(
+        candidates,
+        key=lambda candidate: (candidate[0] - x) ** 2 + (candidate[1] - y) ** 2,
+    )
+
+
+class ColorWheel:
+    """
+    It precomputes the colors of a wheel into a lookup table, with `resolution`
+    colors per wheel color. The colors in between are interpolated with a closed
+    Catmull-Rom spline, so the table follows a smooth path through all the wheel
+    colors.
+    """
+
+    resolution: int
+    _xs: "array[float]"
+    _ys: "array[float]"
+
+    def __init__(
+        self, colors: Colors, resolution: int = 1, gamut: Gamut | None = None
+    ) -> None:
+        if resolution < 1:
+            raise ValueError(
+                f"`color_wheel_resolution` must be at least 1, {resolution} was given"
+            )
+        self.resolution = resolution
+        self._xs = array("d")
+        self._ys = array("d")
+        size = len(colors)
+        for index in range(size):
+            p0, p1, p2, p3 = (colors[(index + i) % size] for i in (-1, 0, 1, 2))
+            for sample in range(resolution):
+                t = sample / resolution
+                color = (
+                    ColorWheel._catmull_rom(p0[0], p1[0], p2[0], p3[0], t),
+                    ColorWheel._catmull_rom(p0[1], p1[1], p2[1], p3[1], t),
+                )
+                if gamut is not None:
+                    color = clip_to_gamut(color, gamut)
+                self._xs.append(color[0])
+                self._ys.append(color[1])
+
+    @staticmethod
+    def _catmull_rom(p0: float, p1: float, p2: float, p3: float, t: float) -> float:
+        return 0.5 * (
+            2 * p1
+            + (p2 - p0) * t
+            + (2 * p0 - 5 * p1 + 4 * p2 - p3) * t**2
+            + (3 * p1 - p0 - 3 * p2 + p3) * t**3
+        )
+
+    def __len__(self) -> int:
+        return len(self._xs)
+
+    def __getitem__(self, index: int) -> Color:
+        index %= len(self._xs)
+        return (round(self._xs[index], 3), round(self._ys[index], 3))
+
+
+@lru_cache(maxsize=None)
+def _get_color_wheel_lut(
+    colors: tuple[Color, ...], resolution: int, gamut: Gamut | None
+) -> ColorWheel:
+    return ColorWheel(list(colors), resolution, gamut)
+
+
+def get_color_wheel_lut(
+    colors: Colors, resolution: int = 1, gamut: Gamut | None = None
+) -> ColorWheel:
+    """
+    It returns the lookup table of the wheel, built once for all
+    the controllers with the same wheel, resolution and gamut.
+    """
+    # Colors from the configuration are lists, so they are hashed as tuples
+    return _get_color_wheel_lut(tuple((x, y) for x, y in colors), resolution, gamut)
@@ -1,11 +1,13 @@
 import asyncio
+import logging
 import re
 import time
 from ast import literal_eval
 from asyncio import CancelledError, Task
-from collections import Counter, defaultdict
+from collections import defaultdict
 from collections.abc import Awaitable, Callable
-from functools import wraps
+from dataclasses import dataclass, field
+from functools import lru_cache, wraps
 from typing import (
     Any,
     DefaultDict,
@@ -30,10 +32,25 @@ from cx_const import (
 from cx_core import integration as integration_module
 from cx_core.action_type import ActionsMapping, parse_actions
 from cx_core.action_type.base import ActionType
+from cx_core.event_hub import unregister_controller
+from cx_core.event_window import EVENT_WINDOW_THROTTLE, EventWindow
 from cx_core.integration import EventData, Integration
+from cx_core.metrics import (
+    METRICS_ARGS,
+    STAGE_SERVICE,
+    STAGE_STATE,
+    STAGE_TEMPLATE,
+    ActionMetrics,
+)
+from cx_core.service_queue import (
+    DEFAULT_MAX_IN_FLIGHT,
+    ServiceCallQueue,
+    get_service_queue,
+)
 
 DEFAULT_ACTION_DELTA = 300  # In milliseconds
 DEFAULT_MULTIPLE_CLICK_DELAY = 500  # In milliseconds
+DEFAULT_TEMPLATE_CACHE_TTL = 0  # In seconds
 MULTIPLE_CLICK_TOKEN = "$"
 
 MODE_SINGLE = "single"
@@ -44,6 +61,38 @@ MODE_PARALLEL = "parallel"
 T = TypeVar("T")
 
 
+@dataclass(slots=True)
+class ActionRecord:
+    """
+    Compiled settings for an action event, so the event path only needs
+    a single lookup to decide what to do with it.
+    """
+
+    action_types: list[ActionType] = field(default_factory=list)
+    delta: int = DEFAULT_ACTION_DELTA
+    delay: int = 0
+    mode: str = MODE_SINGLE
+    previous_state: str | None = None
+    multiple_click: bool = False
+    last_call_time: float = 0.0
+    event_window: EventWindow | None = None
+    # Highest click count mapped for a multiple click action (e.g. 3 for `toggle$3`)
+    max_clicks: int = 0
+
+
+@dataclass(slots=True)
+class MultipleClickState:
+    """
+    Clicks counted for an action. The timer is only re-scheduled when it expires
+    before the deadline, since each click just moves the deadline forward.
+    """
+
+    count: int = 0
+    deadline: float = 0.0
+    extra: EventData | None = None
+    timer: asyncio.TimerHandle | None = None
+
+
 def action(method: Callable[..., Awaitable[Any]]) -> ActionFunction:
     @wraps(method)
     async def _action_impl(controller: "Controller", *args: Any, **kwargs: Any) -> None:
@@ -54,21 +103,6 @@ def action(method: Callable[..., Awaitable[Any]]) -> ActionFunction:
     return _action_impl
 
 
-def run_in(fn: Callable[..., Any], delay: float, **kwargs: Any) -> "Task[None]":
-    """
-    It runs the function (fn) in running event loop in `delay` seconds.
-    This function has been created because the default run_in function
-    from AppDaemon does not accept microseconds.
-    """
-
-    async def inner() -> None:
-        await asyncio.sleep(delay)
-        await fn(kwargs)
-
-    task = asyncio.create_task(inner())
-    return task
-
-
 class Controller(Hass, Mqtt):  # type: ignore[misc]
     """
     This is the parent Controller, all controllers must extend from this class.
@@ -77,17 +111,17 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
     args: dict[str, Any]
     integration: Integration
     actions_mapping: ActionsMapping
+    action_records: dict[ActionEvent, ActionRecord]
     action_handles: DefaultDict[ActionEvent, Optional["Task[None]"]]
     action_delay_handles: dict[ActionEvent, str | None]
-    multiple_click_actions: set[ActionEvent]
-    action_delay: dict[ActionEvent, int]
-    action_delta: dict[ActionEvent, int]
-    action_times: dict[str, float]
-    previous_states: dict[ActionEvent, str | None]
-    multiple_click_action_times: dict[str, float]
-    click_counter: Counter[ActionEvent]
-    multiple_click_action_delay_tasks: DefaultDict[ActionEvent, Optional["Task[None]"]]
+    multiple_click_states: dict[ActionEvent, MultipleClickState]
+    multiple_click_tasks: set["Task[None]"]
     multiple_click_delay: int
+    multiple_click_early_fire: bool = False
+    template_cache_ttl: float = DEFAULT_TEMPLATE_CACHE_TTL
+    _template_cache: dict[str, tuple[float, Any]]
+    service_queue: ServiceCallQueue | None = None
+    metrics: ActionMetrics | None = None
 
     async def initialize(self) -> None:
         self.log(f"🎮 ControllerX {cx_version.__version__}", ascii_encode=False)
@@ -97,6 +131,22 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
         controllers_ids: list[str] = self.get_list(self.args["controller"])
         self.integration = self.get_integration(self.args["integration"])
 
+        self.template_cache_ttl = self.args.get(
+            "template_cache_ttl", DEFAULT_TEMPLATE_CACHE_TTL
+        )
+        self._template_cache = {}
+
+        if self.args.get("coalesce_service_calls", False):
+            self.service_queue = get_service_queue(
+                self.args.get("max_in_flight_service_calls", DEFAULT_MAX_IN_FLIGHT)
+            )
+
+        if "metrics" in self.args:
+            metrics_args: dict[str, Any] = self.args["metrics"]
+            for key in metrics_args:
+                self.get_option(key, METRICS_ARGS, "`metrics`")
+            self.metrics = ActionMetrics(self, self.name, **metrics_args)
+
         if "mapping" in self.args and "merge_mapping" in self.args:
             raise ValueError("`mapping` and `merge_mapping` cannot be used together")
 
@@ -128,7 +178,7 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
         )
 
         # Action delay
-        self.action_delay = self.get_mapping_per_action(
+        action_delay = self.get_mapping_per_action(
             self.actions_mapping,
             custom=self.args.get("action_delay"),
             default=0,
@@ -137,40 +187,64 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
         self.action_handles = defaultdict(lambda: None)
 
         # Action delta
-        self.action_delta = self.get_mapping_per_action(
+        action_delta = self.get_mapping_per_action(
             self.actions_mapping,
             custom=self.args.get("action_delta"),
             default=DEFAULT_ACTION_DELTA,
         )
-        self.action_times = defaultdict(float)
 
         # Previous state
-        self.previous_states = self.get_mapping_per_action(
+        previous_states: dict[ActionEvent, str | None] = self.get_mapping_per_action(
             self.actions_mapping,
             custom=self.args.get("previous_state"),
             default=None,
         )
 
         # Multiple click
-        self.multiple_click_actions = self.get_multiple_click_actions(
-            self.actions_mapping
-        )
+        multiple_click_actions = self.get_multiple_click_actions(self.actions_mapping)
         self.multiple_click_delay = self.args.get(
             "multiple_click_delay", DEFAULT_MULTIPLE_CLICK_DELAY
         )
-        self.multiple_click_action_times = defaultdict(float)
-        self.click_counter = Counter()
-        self.multiple_click_action_delay_tasks = defaultdict(lambda: None)
+        self.multiple_click_early_fire = self.args.get(
+            "multiple_click_early_fire", False
+        )
+        self.multiple_click_states = {}
+        self.multiple_click_tasks = set()
 
         # Mode
-        self.mode = self.get_mapping_per_action(
+        mode = self.get_mapping_per_action(
             self.actions_mapping, custom=self.args.get("mode"), default=MODE_SINGLE
         )
 
+        # Event window
+        event_window = self.get_mapping_per_action(
+            self.actions_mapping, custom=self.args.get("event_window"), default=0
+        )
+        event_window_mode = self.get_mapping_per_action(
+            self.actions_mapping,
+            custom=self.args.get("event_window_mode"),
+            default=EVENT_WINDOW_THROTTLE,
+        )
+
+        self.action_records = self.compile_action_records(
+            self.actions_mapping,
+            action_delay=action_delay,
+            action_delta=action_delta,
+            previous_states=previous_states,
+            mode=mode,
+            multiple_click_actions=multiple_click_actions,
+            event_window=event_window,
+            event_window_mode=event_window_mode,
+        )
+
         # Listen for device changes
         for controller_id in controllers_ids:
             await self.integration.listen_changes(controller_id)
 
+    async def terminate(self) -> None:
+        # It stops receiving events from the listeners shared with other controllers
+        await unregister_controller(self)
+
     def filter_actions(
         self,
         actions_mapping: ActionsMapping,
@@ -194,6 +268,23 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
                 f"The options are {options}"
             )
 
+    def is_logging(self, level: str | int) -> bool:
+        """
+        It checks if a message with this level would be logged, so it can
+        be skipped before formatting it.
+        """
+        level_no: int = level if isinstance(level, int) else logging.getLevelName(level)
+        # AppDaemon logger, which is not present when AppDaemon is not running
+        logger: logging.Logger | None = getattr(self, "logger", None)
+        return logger is None or logger.isEnabledFor(level_no)
+
+    def log(
+        self, msg: str, *args: Any, level: str | int = "INFO", **kwargs: Any
+    ) -> None:
+        # Arguments are only formatted if the message is logged
+        if self.is_logging(level):
+            super().log(msg, *args, level=level, **kwargs)
+
     def parse_integration(
         self, integration: str | dict[str, Any] | Any
     ) -> dict[str, str]:
@@ -212,11 +303,11 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
     def get_integration(self, integration: str | dict[str, Any]) -> Integration:
         parsed_integration = self.parse_integration(integration)
         kwargs = {k: v for k, v in parsed_integration.items() if k != "name"}
-        integrations = integration_module.get_integrations(self, kwargs)
+        integration_classes = integration_module.get_integration_classes()
         integration_argument = self.get_option(
-            parsed_integration["name"], [i.name for i in integrations]
+            parsed_integration["name"], list(integration_classes)
         )
-        return next(i for i in integrations if i.name == integration_argument)
+        return integration_classes[integration_argument](self, kwargs)
 
     def get_default_actions_mapping(
         self, integration: Integration
@@ -282,18 +373,91 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
             if action is not None
         }
 
+    def compile_action_records(
+        self,
+        actions_mapping: ActionsMapping,
+        *,
+        action_delay: dict[ActionEvent, int],
+        action_delta: dict[ActionEvent, int],
+        previous_states: dict[ActionEvent, str | None],
+        mode: dict[ActionEvent, str],
+        multiple_click_actions: set[ActionEvent],
+        event_window: dict[ActionEvent, int] | None = None,
+        event_window_mode: dict[ActionEvent, str] | None = None,
+    ) -> dict[ActionEvent, ActionRecord]:
+        records = {
+            key: ActionRecord(
+                action_types=action_types,
+                delta=action_delta[key],
+                delay=action_delay[key],
+                mode=mode[key],
+                previous_state=previous_states[key],
+                multiple_click=key in multiple_click_actions,
+                # Multiple clicks are counted on every event, so they are not windowed
+                event_window=(
+                    None
+                    if key in multiple_click_actions
+                    else self.get_event_window(
+                        key,
+                        (event_window or {}).get(key, 0),
+                        (event_window_mode or {}).get(key, EVENT_WINDOW_THROTTLE),
+                    )
+                ),
+            )
+            for key, action_types in actions_mapping.items()
+        }
+        # Multiple click actions might not be mapped themselves (e.g. only `toggle$2`)
+        # but still need to be dispatched to count the clicks.
+        for key in multiple_click_actions:
+            if key not in records:
+                records[key] = ActionRecord(multiple_click=True)
+        for key, max_clicks in self.get_multiple_click_max_counts(
+            actions_mapping
+        ).items():
+            if key in records:
+                records[key].max_clicks = max_clicks
+        return records
+
+    def get_event_window(
+        self, action_key: ActionEvent, window: int, mode: str
+    ) -> EventWindow | None:
+        if window <= 0:
+            return None
+
+        async def call(extra: EventData | None) -> None:
+            await self.call_action(action_key, extra=extra)
+
+        return EventWindow(
+            call,
+            mode,
+            window,
+            self.args.get("event_window_keys"),
+            log=self.log,
+        )
+
     def get_multiple_click_actions(self, mapping: ActionsMapping) -> set[ActionEvent]:
-        to_return: set[ActionEvent] = set()
+        return set(self.get_multiple_click_max_counts(mapping))
+
+    def get_multiple_click_max_counts(
+        self, mapping: ActionsMapping
+    ) -> dict[ActionEvent, int]:
+        to_return: dict[ActionEvent, int] = {}
         for key in mapping.keys():
             if not isinstance(key, str) or MULTIPLE_CLICK_TOKEN not in key:
                 continue
             splitted = key.split(MULTIPLE_CLICK_TOKEN)
             assert 1 <= len(splitted) <= 2
-            action_key, _ = splitted
+            action_key_str, click_count = splitted
+            action_key: ActionEvent
+            try:
+                action_key = int(action_key_str)
+            except ValueError:
+                action_key = action_key_str
             try:
-                to_return.add(int(action_key))
+                count = int(click_count)
             except ValueError:
-                to_return.add(action_key)
+                count = 0
+            to_return[action_key] = max(to_return.get(action_key, 0), count)
         return to_return
 
     def format_multiple_click_action(
@@ -304,7 +468,11 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
         )  # e.g. toggle$2
 
     async def _render_template(self, template: str) -> Any:
-        result = await self.render_template(template)
+        if self.metrics is not None:
+            with self.metrics.measure(STAGE_TEMPLATE):
+                result = await self.render_template(template)
+        else:
+            result = await self.render_template(template)
         if result is None:
             raise ValueError(f"Template {template} returned None")
         try:
@@ -314,39 +482,87 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
 
     _TEMPLATE_RE = re.compile(r"\s*\{\{.*\}\}")
 
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _is_template(template: str) -> bool:
+        return Controller._TEMPLATE_RE.search(template) is not None
+
     def contains_templating(self, template: str) -> bool:
-        is_template = self._TEMPLATE_RE.search(template) is not None
-        if not is_template:
-            self.log(f"`{template}` is not recognized as a template", level="DEBUG")
-        return is_template
+        # Values come mostly from the configuration, so the regex is only
+        # evaluated once for each of them.
+        return self._is_template(template)
+
+    async def _render_cached_template(self, template: str) -> Any:
+        now = time.monotonic()
+        cached = self._template_cache.get(template)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        result = await self._render_template(template)
+        self._template_cache[template] = (now + self.template_cache_ttl, result)
+        return result
 
     async def render_value(self, value: Any) -> Any:
         if isinstance(value, str) and self.contains_templating(value):
+            if self.template_cache_ttl > 0:
+                return await self._render_cached_template(value)
             return await self._render_template(value)
         else:
             return value
 
-    async def render_attributes(self, attributes: dict[str, Any]) -> dict[str, Any]:
+    def _collect_templates(
+        self,
+        attributes: dict[str, Any],
+        templates: list[tuple[dict[str, Any], str, str]],
+    ) -> dict[str, Any]:
+        """
+        It copies the attributes (and nested dictionaries) and collects
+        the templates to render, together with the dictionary and key
+        where the rendered value needs to be placed.
+        """
         new_attributes: dict[str, Any] = {}
         for key, value in attributes.items():
-            new_value = await self.render_value(value)
             if isinstance(value, dict):
-                new_value = await self.render_attributes(value)
-            new_attributes[key] = new_value
+                value = self._collect_templates(value, templates)
+            elif isinstance(value, str) and self.contains_templating(value):
+                templates.append((new_attributes, key, value))
+            new_attributes[key] = value
+        return new_attributes
+
+    async def render_attributes(self, attributes: dict[str, Any]) -> dict[str, Any]:
+        templates: list[tuple[dict[str, Any], str, str]] = []
+        new_attributes = self._collect_templates(attributes, templates)
+        if templates:
+            # All the templates from the tree are rendered concurrently
+            rendered_values = await asyncio.gather(
+                *(self.render_value(template) for _, _, template in templates)
+            )
+            for (container, key, _), rendered_value in zip(templates, rendered_values):
+                container[key] = rendered_value
         return new_attributes
 
     async def call_service(
         self, service: str, render_template: bool = True, **attributes: Any
     ) -> Any | None:
         service = service.replace(".", "/")
-        to_log = ["\n", f"🤖 Service: \033[1m{service.replace('/', '.')}\033[0m"]
         if service != "template/render" and render_template:
             attributes = await self.render_attributes(attributes)
-        for attribute, value in attributes.items():
-            if isinstance(value, float):
-                value = f"{value:.2f}"
-            to_log.append(f"  - {attribute}: {value}")
-        self.log("\n".join(to_log), level="INFO", ascii_encode=False)
+        if self.service_queue is not None:
+            return await self.service_queue.call(
+                self._call_service, service, **attributes
+            )
+        return await self._call_service(service, **attributes)
+
+    async def _call_service(self, service: str, **attributes: Any) -> Any | None:
+        if self.is_logging("INFO"):
+            to_log = ["\n", f"🤖 Service: \033[1m{service.replace('/', '.')}\033[0m"]
+            for attribute, value in attributes.items():
+                if isinstance(value, float):
+                    value = f"{value:.2f}"
+                to_log.append(f"  - {attribute}: {value}")
+            self.log("\n".join(to_log), level="INFO", ascii_encode=False)
+        if self.metrics is not None:
+            with self.metrics.measure(STAGE_SERVICE):
+                return await ADAPI.call_service(self, service, **attributes)
         return await ADAPI.call_service(self, service, **attributes)
 
     @utils.sync_decorator  # type: ignore[untyped-decorator]
@@ -360,6 +576,11 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
         **kwargs: dict[str, Any],  # left in intentionally for compatibility
     ) -> Any | dict[str, Any] | None:
         rendered_entity_id = await self.render_value(entity_id)
+        if self.metrics is not None:
+            with self.metrics.measure(STAGE_STATE):
+                return await super().get_state(
+                    rendered_entity_id, attribute, default=default, copy=copy
+                )
         return await super().get_state(
             rendered_entity_id, attribute, default=default, copy=copy
         )
@@ -370,66 +591,101 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
         previous_state: str | None = None,
         extra: EventData | None = None,
     ) -> None:
-        if (
-            action_key in self.actions_mapping
-            and self.previous_states[action_key] is not None
-            and previous_state != self.previous_states[action_key]
-        ):
+        if self.metrics is not None:
+            self.metrics.event_received()
+        record = self.action_records.get(action_key)
+        if record is None:
             self.log(
-                f"🎮 `{action_key}` not triggered because previous action was `{previous_state}`",
+                "🎮 Button event triggered, but not registered: `%s`",
+                action_key,
                 level="DEBUG",
                 ascii_encode=False,
             )
             return
         if (
-            action_key in self.actions_mapping
-            and action_key not in self.multiple_click_actions
+            record.previous_state is not None
+            and previous_state != record.previous_state
         ):
-            previous_call_time = self.action_times[action_key]
-            now = time.time() * 1000
-            self.action_times[action_key] = now
-            if now - previous_call_time > self.action_delta[action_key]:
-                await self.call_action(action_key, extra=extra)
-        elif action_key in self.multiple_click_actions:
-            now = time.time() * 1000
-            previous_call_time = self.multiple_click_action_times.get(action_key, now)
-            self.multiple_click_action_times[action_key] = now
-            if now - previous_call_time > self.multiple_click_delay:
-                pass
-
-            previous_task = self.multiple_click_action_delay_tasks[action_key]
-            if previous_task is not None:
-                previous_task.cancel()
-
-            self.click_counter[action_key] += 1
-            click_count = self.click_counter[action_key]
-
-            new_task = run_in(
-                self.multiple_click_call_action,
-                self.multiple_click_delay / 1000,
-                action_key=action_key,
-                extra=extra,
-                click_count=click_count,
-            )
-            self.multiple_click_action_delay_tasks[action_key] = new_task
-        else:
             self.log(
-                f"🎮 Button event triggered, but not registered: `{action_key}`",
+                "🎮 `%s` not triggered because previous action was `%s`",
+                action_key,
+                previous_state,
                 level="DEBUG",
                 ascii_encode=False,
             )
+            return
+        if record.event_window is not None:
+            # The window replaces `action_delta` to filter repeated events
+            await record.event_window.push(extra)
+        elif not record.multiple_click:
+            previous_call_time = record.last_call_time
+            now = time.time() * 1000
+            record.last_call_time = now
+            if now - previous_call_time > record.delta:
+                await self.call_action(action_key, extra=extra)
+        else:
+            state = self.multiple_click_states.get(action_key)
+            if state is None:
+                state = self.multiple_click_states[action_key] = MultipleClickState()
+            state.count += 1
+            state.extra = extra
+            if self.multiple_click_early_fire and state.count >= record.max_clicks > 0:
+                # No more clicks are mapped, so there is no need to wait
+                if state.timer is not None:
+                    state.timer.cancel()
+                    state.timer = None
+                await self.multiple_click_call_action(
+                    self.pop_multiple_click(action_key, state)
+                )
+                return
+            loop = asyncio.get_running_loop()
+            state.deadline = loop.time() + self.multiple_click_delay / 1000
+            if state.timer is None:
+                state.timer = loop.call_at(
+                    state.deadline, self.multiple_click_timer_callback, action_key
+                )
+
+    def multiple_click_timer_callback(self, action_key: ActionEvent) -> None:
+        state = self.multiple_click_states[action_key]
+        loop = asyncio.get_running_loop()
+        if state.deadline - loop.time() > 0.001:
+            # There were more clicks after the timer was scheduled
+            state.timer = loop.call_at(
+                state.deadline, self.multiple_click_timer_callback, action_key
+            )
+            return
+        state.timer = None
+        # The clicks are taken now, so the ones arriving before the task runs
+        # start a new batch with a new timer
+        task = asyncio.ensure_future(
+            self.multiple_click_call_action(self.pop_multiple_click(action_key, state))
+        )
+        self.multiple_click_tasks.add(task)
+        task.add_done_callback(self.multiple_click_tasks.discard)
+
+    def pop_multiple_click(
+        self, action_key: ActionEvent, state: MultipleClickState
+    ) -> dict[str, Any]:
+        kwargs = {
+            "action_key": action_key,
+            "extra": state.extra,
+            "click_count": state.count,
+        }
+        state.count = 0
+        state.extra = None
+        return kwargs
 
     async def multiple_click_call_action(self, kwargs: dict[str, Any]) -> None:
         action_key: ActionEvent = kwargs["action_key"]
         extra: EventData = kwargs["extra"]
         click_count: int = kwargs["click_count"]
-        self.multiple_click_action_delay_tasks[action_key] = None
         self.log(
-            f"🎮 {action_key} clicked `{click_count}` time(s)",
+            "🎮 %s clicked `%s` time(s)",
+            action_key,
+            click_count,
             level="DEBUG",
             ascii_encode=False,
         )
-        self.click_counter[action_key] = 0
         click_action_key = self.format_multiple_click_action(action_key, click_count)
         if click_action_key in self.actions_mapping:
             await self.call_action(click_action_key, extra=extra)
@@ -440,36 +696,46 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
         self, action_key: ActionEvent, extra: EventData | None = None
     ) -> None:
         self.log(
-            f"🎮 Button event triggered: `{action_key}`",
+            "🎮 Button event triggered: `%s`",
+            action_key,
             level="INFO",
             ascii_encode=False,
         )
-        self.log(
-            f"Extra:\n{extra}",
-            level="DEBUG",
-        )
-        delay = self.action_delay[action_key]
+        self.log("Extra:\n%s", extra, level="DEBUG")
+        delay = self.action_records[action_key].delay
         if delay > 0:
             handle = self.action_delay_handles[action_key]
             if handle is not None:
                 await self.cancel_timer(handle)
             self.log(
-                f"🕒 Running action(s) from `{action_key}` in {delay} seconds",
+                "🕒 Running action(s) from `%s` in %s seconds",
+                action_key,
+                delay,
                 level="INFO",
                 ascii_encode=False,
             )
+            # The callback does not run in the context of the event
+            metrics_kwargs = (
+                {}
+                if self.metrics is None
+                else {"event_time": self.metrics.get_event_time()}
+            )
             new_handle = await self.run_in(
-                self.action_timer_callback, delay, action_key=action_key, extra=extra
+                self.action_timer_callback,
+                delay,
+                action_key=action_key,
+                extra=extra,
+                **metrics_kwargs,
             )
             self.action_delay_handles[action_key] = new_handle
         else:
             await self.action_timer_callback({"action_key": action_key, "extra": extra})
 
-    async def _apply_mode_strategy(self, action_key: ActionEvent) -> bool:
+    async def _apply_mode_strategy(self, action_key: ActionEvent, mode: str) -> bool:
         previous_task = self.action_handles[action_key]
         if previous_task is None or previous_task.done():
             return False
-        if self.mode[action_key] == MODE_SINGLE:
+        if mode == MODE_SINGLE:
             self.log(
                 f"There is already an action executing for `{action_key}`. "
                 "If you want a different behaviour change `mode` parameter, "
@@ -477,15 +743,15 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
                 level="WARNING",
             )
             return True
-        elif self.mode[action_key] == MODE_RESTART:
+        elif mode == MODE_RESTART:
             previous_task.cancel()
-        elif self.mode[action_key] == MODE_QUEUED:
+        elif mode == MODE_QUEUED:
             await previous_task
-        elif self.mode[action_key] == MODE_PARALLEL:
+        elif mode == MODE_PARALLEL:
             pass
         else:
             raise ValueError(
-                f"`{self.mode[action_key]}` is not a possible value for `mode` parameter."
+                f"`{mode}` is not a possible value for `mode` parameter."
                 "Possible values: `single`, `restart`, `queued` and `parallel`."
             )
         return False
@@ -494,26 +760,34 @@ class Controller(Hass, Mqtt):  # type: ignore[misc]
         action_key: ActionEvent = kwargs["action_key"]
         extra: EventData = kwargs["extra"]
         self.action_delay_handles[action_key] = None
-        skip = await self._apply_mode_strategy(action_key)
+        record = self.action_records[action_key]
+        skip = await self._apply_mode_strategy(action_key, record.mode)
         if skip:
             return
-        action_types = self.actions_mapping[action_key]
-        task = asyncio.create_task(self.call_action_types(action_types, extra))
+        if self.metrics is not None:
+            if "event_time" in kwargs:
+                self.metrics.set_event_time(kwargs["event_time"])
+            self.metrics.action_started(action_key)
+        task = asyncio.create_task(self.call_action_types(record.action_types, extra))
         self.action_handles[action_key] = task
         try:
             await task
         except CancelledError:
             self.log(
-                f"Task(s) from `{action_key}` was/were canceled and executed again",
+                "Task(s) from `%s` was/were canceled and executed again",
+                action_key,
                 level="DEBUG",
             )
+        if self.metrics is not None:
+            await self.metrics.action_finished()
 
     async def call_action_types(
         self, action_types: list[ActionType], extra: EventData | None = None
     ) -> None:
         for action_type in action_types:
             self.log(
-                f"🏃 Running `{action_type}` now",
+                "🏃 Running `%s` now",
+                action_type,
                 level="INFO",
                 ascii_encode=False,
             )
@@ -0,0 +1,126 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TYPE_CHECKING, Any
+
+from appdaemon.plugins.hass.hassapi import Hass
+from cx_core.integration import EventData
+
+if TYPE_CHECKING:
+    from cx_core.controller import Controller
+
+EventCallback = Callable[[str, EventData, dict[str, Any]], Awaitable[None]]
+Listen = Callable[["Controller", EventCallback], Awaitable[Any]]
+Handler = Callable[[Any], Awaitable[None]]
+
+
+class EventHub:
+    """
+    It listens to an event once for all the controllers, and it routes each
+    event through a dictionary to the handlers registered for its key. This
+    way, an event does not wake up every controller to check its own filter.
+    The listener is registered with the first controller, and it is moved to
+    another one if that controller is stopped.
+    """
+
+    name: str
+    routes: dict[Hashable, list[tuple["Controller", Handler]]]
+    owner: "Controller | None"
+    _listen: Listen
+    _get_key: Callable[[EventData], Hashable]
+    _prepare: Callable[[EventData], Any] | None
+
+    def __init__(
+        self,
+        name: str,
+        listen: Listen,
+        get_key: Callable[[EventData], Hashable],
+        prepare: Callable[[EventData], Any] | None = None,
+    ) -> None:
+        self.name = name
+        self.routes = {}
+        self.owner = None
+        self._listen = listen
+        self._get_key = get_key
+        self._prepare = prepare
+
+    async def register(
+        self, controller: "Controller", key: Hashable, handler: Handler
+    ) -> None:
+        self.routes.setdefault(key, []).append((controller, handler))
+        if self.owner is None:
+            await self._subscribe(controller)
+
+    async def unregister(self, controller: "Controller") -> None:
+        for key in list(self.routes):
+            handlers = [
+                (handler_controller, handler)
+                for handler_controller, handler in self.routes[key]
+                if handler_controller is not controller
+            ]
+            if handlers:
+                self.routes[key] = handlers
+            else:
+                del self.routes[key]
+        if self.owner is controller:
+            # AppDaemon already cancels the listeners of the stopped app
+            self.owner = None
+            new_owner = next(
+                (
+                    handler_controller
+                    for handlers in self.routes.values()
+                    for handler_controller, _ in handlers
+                ),
+                None,
+            )
+            if new_owner is not None:
+                await self._subscribe(new_owner)
+
+    async def _subscribe(self, controller: "Controller") -> None:
+        self.owner = controller
+        await self._listen(controller, self.event_callback)
+
+    async def event_callback(
+        self, event_name: str, data: EventData, kwargs: dict[str, Any]
+    ) -> None:
+        handlers = self.routes.get(self._get_key(data))
+        if not handlers:
+            return
+        # Prepared once (e.g. parsing the payload) for all the handlers
+        value = self._prepare(data) if self._prepare is not None else data
+        if value is None:
+            return
+        if len(handlers) == 1:
+            await handlers[0][1](value)
+        else:
+            await asyncio.gather(*(handler(value) for _, handler in handlers))
+
+
+_event_hubs: dict[str, EventHub] = {}
+
+
+def listen_hass_event(event: str) -> Listen:
+    async def listen(controller: "Controller", callback: EventCallback) -> None:
+        await Hass.listen_event(controller, callback, event)
+
+    return listen
+
+
+def get_event_hub(
+    name: str,
+    listen: Listen,
+    get_key: Callable[[EventData], Hashable],
+    prepare: Callable[[EventData], Any] | None = None,
+) -> EventHub:
+    """
+    It returns the hub with the given name, shared by all the controllers
+    running in the same AppDaemon process.
+    """
+    event_hub = _event_hubs.get(name)
+    if event_hub is None:
+        event_hub = _event_hubs[name] = EventHub(name, listen, get_key, prepare)
+    return event_hub
+
+
+async def unregister_controller(controller: "Controller") -> None:
+    for event_hub in list(_event_hubs.values()):
+        await event_hub.unregister(controller)
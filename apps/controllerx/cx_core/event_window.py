@@ -0,0 +1,132 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from cx_core.integration import EventData
+
+EVENT_WINDOW_THROTTLE = "throttle"
+EVENT_WINDOW_DEBOUNCE = "debounce"
+EVENT_WINDOW_ACCUMULATE = "accumulate"
+EVENT_WINDOW_MODES = (
+    EVENT_WINDOW_THROTTLE,
+    EVENT_WINDOW_DEBOUNCE,
+    EVENT_WINDOW_ACCUMULATE,
+)
+
+# Event data fields added up by the `accumulate` mode
+DEFAULT_ACCUMULATED_KEYS = [
+    "action_rotation_angle",
+    "action_rotation_percent",
+    "action_step_size",
+]
+
+
+class EventWindow:
+    """
+    It groups the events of an action fired within `window` milliseconds,
+    so high-frequency controllers (e.g. rotary knobs) run the action once
+    per window. The modes are:
+        - throttle: It runs the first event right away, and the last one
+            of each window when the window finishes.
+        - debounce: It runs the last event once no events arrive for a window.
+        - accumulate: It runs once at the end of the window with the last
+            event data, adding up the `accumulated_keys` of all the events.
+    """
+
+    mode: str
+    window: float
+    accumulated_keys: list[str]
+    _call: Callable[[EventData | None], Awaitable[None]]
+    _log: Callable[..., None] | None
+    _pending: bool
+    _extra: EventData | None
+    _task: "asyncio.Task[None] | None"
+
+    def __init__(
+        self,
+        call: Callable[[EventData | None], Awaitable[None]],
+        mode: str,
+        window: int,
+        accumulated_keys: list[str] | None = None,
+        log: Callable[..., None] | None = None,
+    ) -> None:
+        if mode not in EVENT_WINDOW_MODES:
+            raise ValueError(
+                f"`{mode}` is not a valid event window mode. "
+                f"Options are: {list(EVENT_WINDOW_MODES)}"
+            )
+        self.mode = mode
+        self.window = window / 1000
+        self.accumulated_keys = (
+            DEFAULT_ACCUMULATED_KEYS if accumulated_keys is None else accumulated_keys
+        )
+        self._call = call
+        self._log = log
+        self._pending = False
+        self._extra = None
+        self._task = None
+
+    async def push(self, extra: EventData | None) -> None:
+        if self.mode == EVENT_WINDOW_THROTTLE:
+            if self._task is None:
+                self._start()
+                await self._call(extra)
+                return
+            self._extra = extra
+        elif self.mode == EVENT_WINDOW_DEBOUNCE:
+            if self._task is not None:
+                self._task.cancel()
+            self._extra = extra
+            self._start()
+        else:
+            self._extra = self.accumulate(self._extra if self._pending else None, extra)
+            if self._task is None:
+                self._start()
+        self._pending = True
+
+    def accumulate(
+        self, accumulated: EventData | None, extra: EventData | None
+    ) -> EventData | None:
+        if accumulated is None or extra is None:
+            return extra
+        merged = dict(extra)
+        for key in self.accumulated_keys:
+            previous = accumulated.get(key)
+            current = extra.get(key)
+            if isinstance(previous, (int, float)) and isinstance(current, (int, float)):
+                merged[key] = previous + current
+        return merged
+
+    def _start(self) -> None:
+        self._task = asyncio.ensure_future(self._wait())
+        self._task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: "asyncio.Task[None]") -> None:
+        # The trailing calls run in this task, so nobody else awaits their errors
+        if task.cancelled():
+            return
+        exception = task.exception()
+        if exception is None:
+            return
+        if self._log is not None:
+            self._log("Event window call failed: %r", exception, level="ERROR")
+        else:
+            task.get_loop().call_exception_handler(
+                {
+                    "message": "Event window call failed",
+                    "exception": exception,
+                    "future": task,
+                }
+            )
+
+    async def _wait(self) -> None:
+        await asyncio.sleep(self.window)
+        self._task = None
+        if not self._pending:
+            return
+        extra = self._extra
+        self._pending = False
+        self._extra = None
+        if self.mode == EVENT_WINDOW_THROTTLE:
+            # The trailing call opens a new window
+            self._start()
+        await self._call(extra)
@@ -1,4 +1,5 @@
 import abc
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
 from cx_const import DefaultActionsMapping
@@ -27,9 +28,21 @@ class Integration(abc.ABC):
         raise NotImplementedError
 
 
+@lru_cache(maxsize=None)
+def get_integration_classes() -> dict[str, type[Integration]]:
+    """
+    It returns the integration classes by name. The modules are only scanned
+    the first time, since they are the same for all the controllers.
+    """
+    integration_classes: list[type[Integration]] = get_classes(
+        __file__, __package__, Integration
+    )
+    return {cls_.name: cls_ for cls_ in integration_classes}
+
+
 def get_integrations(
     controller: "Controller", kwargs: dict[str, Any]
 ) -> list[Integration]:
-    integration_classes = get_classes(__file__, __package__, Integration)
-    integrations = [cls_(controller, kwargs) for cls_ in integration_classes]
+    integration_classes = get_integration_classes()
+    integrations = [cls_(controller, kwargs) for cls_ in integration_classes.values()]
     return integrations
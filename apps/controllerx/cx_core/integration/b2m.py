@@ -23,7 +23,7 @@ class B2MIntegration(Integration):
     async def event_callback(
         self, event_name: str, data: EventData, kwargs: dict[str, Any]
     ) -> None:
-        self.controller.log(f"MQTT data event: {data}", level="DEBUG")
+        self.controller.log("MQTT data event: %s", data, level="DEBUG")
         if "payload" not in data:
             return
         await self.controller.handle_action(data["payload"])
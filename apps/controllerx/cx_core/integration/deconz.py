@@ -1,12 +1,16 @@
+from functools import partial
 from typing import Any
 
 from appdaemon.plugins.hass.hassapi import Hass
 from cx_const import DefaultActionsMapping
+from cx_core.event_hub import get_event_hub, listen_hass_event
 from cx_core.integration import EventData, Integration
 
 LISTENS_TO_ID = "id"
 LISTENS_TO_UNIQUE_ID = "unique_id"
 
+DEFAULT_SHARED_LISTENER = False
+
 
 class DeCONZIntegration(Integration):
     name = "deconz"
@@ -20,11 +24,25 @@ class DeCONZIntegration(Integration):
             raise ValueError(
                 "`listens_to` for deCONZ integration should either be `id` or `unique_id`"
             )
+        if self.kwargs.get("shared_listener", DEFAULT_SHARED_LISTENER):
+            # One hub for each namespace and attribute, since it listens in the
+            # namespace of its owner and events are routed by the attribute value
+            event_hub = get_event_hub(
+                f"deconz_event:{self.controller.namespace}:{listens_to}",
+                listen_hass_event("deconz_event"),
+                lambda data: data.get(listens_to),
+            )
+            await event_hub.register(
+                self.controller,
+                controller_id,
+                partial(self.event_callback, "deconz_event", kwargs={}),
+            )
+            return
         await Hass.listen_event(
             self.controller,
             self.event_callback,
             "deconz_event",
-            **{listens_to: controller_id}
+            **{listens_to: controller_id},
         )
 
     async def event_callback(
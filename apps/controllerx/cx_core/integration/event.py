@@ -1,8 +1,13 @@
+from collections.abc import Callable
+from functools import cached_property
+from string import Formatter
 from typing import Any
 
 from appdaemon.plugins.hass.hassapi import Hass
 from cx_core.integration import EventData, Integration
 
+CONVERSIONS = (None, "r", "s", "a")
+
 
 class EventIntegration(Integration):
     name = "event"
@@ -13,9 +18,28 @@ class EventIntegration(Integration):
         except KeyError:
             raise ValueError(f"{arg} is a mandatory field for event integration.")
 
+    @cached_property
+    def action_template(self) -> str:
+        action_template: str = self.get_arg("action_template")
+        try:
+            for _, _, _, conversion in Formatter().parse(action_template):
+                if conversion not in CONVERSIONS:
+                    raise ValueError(f"Unknown conversion `!{conversion}`")
+        except ValueError as e:
+            raise ValueError(
+                f"`{action_template}` is not a valid action_template: {e}"
+            ) from e
+        return action_template
+
+    @cached_property
+    def format_action(self) -> Callable[[EventData], str]:
+        return self.action_template.format_map
+
     async def listen_changes(self, controller_id: str) -> None:
         event_type: str = self.get_arg("event_type")
         controller_key: str = self.get_arg("controller_key")
+        # The template is validated and resolved once, not on every event
+        self.format_action
         self.controller.log(
             f"Listening to `{event_type}` events for controller `{controller_key}={controller_id}`"
         )
@@ -29,12 +53,14 @@ class EventIntegration(Integration):
     async def event_callback(
         self, event_name: str, data: EventData, kwargs: dict[str, Any]
     ) -> None:
-        action_template: str = self.get_arg("action_template")
         try:
-            action = action_template.format(**data)
-        except Exception:
+            action = self.format_action(data)
+        except (KeyError, IndexError, AttributeError, TypeError, ValueError):
+            # The event does not have the fields (or types) used in the template
             self.controller.log(
-                f"Template `{action_template}` could not be rendered with data={data}",
+                "Template `%s` could not be rendered with data=%s",
+                self.action_template,
+                data,
                 level="WARNING",
             )
             return
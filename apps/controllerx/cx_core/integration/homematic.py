@@ -1,35 +1,38 @@
-from typing import TYPE_CHECKING, Any
+from functools import partial
+from typing import Any
 
-from appdaemon.plugins.hass.hassapi import Hass
 from cx_const import DefaultActionsMapping
+from cx_core.event_hub import get_event_hub, listen_hass_event
 from cx_core.integration import EventData, Integration
 
-if TYPE_CHECKING:
-    from cx_core.controller import Controller
+
+def _get_name(data: EventData) -> str | None:
+    return data.get("name")
 
 
 class HomematicIntegration(Integration):
     name = "homematic"
-    _registered_controller_ids: set[str]
-
-    def __init__(self, controller: "Controller", kwargs: dict[str, Any]):
-        self._registered_controller_ids = set()
-        super().__init__(controller, kwargs)
 
     def get_default_actions_mapping(self) -> DefaultActionsMapping | None:
         return self.controller.get_homematic_actions_mapping()
 
     async def listen_changes(self, controller_id: str) -> None:
-        self._registered_controller_ids.add(controller_id)
-        await Hass.listen_event(
-            self.controller, self.event_callback, "homematic.keypress"
+        # Keypress events cannot be filtered by name, so a single listener per
+        # namespace routes them to the controllers instead of waking up all of them
+        event_hub = get_event_hub(
+            f"homematic.keypress:{self.controller.namespace}",
+            listen_hass_event("homematic.keypress"),
+            _get_name,
+        )
+        await event_hub.register(
+            self.controller,
+            controller_id,
+            partial(self.event_callback, "homematic.keypress", kwargs={}),
         )
 
     async def event_callback(
         self, event_name: str, data: EventData, kwargs: dict[str, Any]
     ) -> None:
-        if data["name"] not in self._registered_controller_ids:
-            return
         param = data["param"]
         channel = data["channel"]
         action = f"{param}_{channel}"
@@ -20,7 +20,7 @@ class MQTTIntegration(Integration):
     async def event_callback(
         self, event_name: str, data: EventData, kwargs: dict[str, Any]
     ) -> None:
-        self.controller.log(f"MQTT data event: {data}", level="DEBUG")
+        self.controller.log("MQTT data event: %s", data, level="DEBUG")
         payload_key = self.kwargs.get("key")
         if "payload" not in data:
             return
@@ -26,7 +26,7 @@ class TasmotaIntegration(Integration):
     async def event_callback(
         self, event_name: str, data: EventData, kwargs: dict[str, Any]
     ) -> None:
-        self.controller.log(f"MQTT data event: {data}", level="DEBUG")
+        self.controller.log("MQTT data event: %s", data, level="DEBUG")
         component_key: str = self.kwargs["component"]
         payload_key: str = self.kwargs.get("key", "Action")
         if "payload" not in data:
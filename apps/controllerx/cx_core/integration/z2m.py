@@ -1,15 +1,64 @@
 import json
-from typing import Any
+from collections.abc import Callable
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
 from appdaemon.plugins.hass.hassapi import Hass
 from appdaemon.plugins.mqtt.mqttapi import Mqtt
 from cx_const import DefaultActionsMapping
+from cx_core.event_hub import EventCallback, get_event_hub
 from cx_core.integration import EventData, Integration
 
+if TYPE_CHECKING:
+    from cx_core.controller import Controller
+
 LISTENS_TO_HA = "ha"
 LISTENS_TO_MQTT = "mqtt"
 LISTENS_TO_EVENT = "event"
 
+DEFAULT_ACTION_KEY = "action"
+DEFAULT_SHARED_LISTENER = False
+
+json_loads: Callable[[str | bytes], Any]
+try:
+    # Faster JSON parser, used if it is installed
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:  # pragma: no cover
+    json_loads = json.loads
+
+
+async def _listen_mqtt(controller: "Controller", callback: EventCallback) -> None:
+    # Without a topic, it receives all the topics subscribed by the MQTT plugin.
+    # `wildcard` cannot be used since it matches the plugin subscription (e.g. `#`)
+    await Mqtt.listen_event(controller, callback, namespace="mqtt")
+
+
+def _get_topic(data: EventData, topic_prefix: str) -> str | None:
+    topic: str | None = data.get("topic")
+    if topic is None or not topic.startswith(f"{topic_prefix}/"):
+        return None
+    return topic
+
+
+def _load_payload(data: EventData, action_key: str) -> dict[str, Any] | None:
+    """
+    It returns None without parsing the payload if the action key is not in it,
+    since most of the messages are state updates (battery, linkquality...).
+    """
+    if "payload" not in data:
+        return None
+    raw_payload: str | bytes = data["payload"]
+    needle = f'"{action_key}"'
+    if isinstance(raw_payload, bytes):
+        if needle.encode() not in raw_payload:
+            return None
+    elif needle not in raw_payload:
+        return None
+    payload: dict[str, Any] = json_loads(raw_payload)
+    return payload
+
 
 class Z2MIntegration(Integration):
     name = "z2m"
@@ -29,12 +78,23 @@ class Z2MIntegration(Integration):
             await Hass.listen_state(self.controller, self.state_callback, controller_id)
         elif listens_to == LISTENS_TO_MQTT:
             topic_prefix = self.kwargs.get("topic_prefix", "zigbee2mqtt")
-            await Mqtt.listen_event(
-                self.controller,
-                self.event_callback,
-                topic=f"{topic_prefix}/{controller_id}",
-                namespace="mqtt",
-            )
+            topic = f"{topic_prefix}/{controller_id}"
+            if self.kwargs.get("shared_listener", DEFAULT_SHARED_LISTENER):
+                action_key = self.kwargs.get("action_key", DEFAULT_ACTION_KEY)
+                event_hub = get_event_hub(
+                    f"z2m:{topic_prefix}:{action_key}",
+                    _listen_mqtt,
+                    partial(_get_topic, topic_prefix=topic_prefix),
+                    prepare=partial(_load_payload, action_key=action_key),
+                )
+                await event_hub.register(self.controller, topic, self.payload_callback)
+            else:
+                await Mqtt.listen_event(
+                    self.controller,
+                    self.event_callback,
+                    topic=topic,
+                    namespace="mqtt",
+                )
         elif listens_to == LISTENS_TO_EVENT:
             await Hass.listen_state(
                 self.controller,
@@ -50,16 +110,22 @@ class Z2MIntegration(Integration):
     async def event_callback(
         self, event_name: str, data: EventData, kwargs: dict[str, Any]
     ) -> None:
-        self.controller.log(f"MQTT data event: {data}", level="DEBUG")
-        action_key = self.kwargs.get("action_key", "action")
-        action_group_key = self.kwargs.get("action_group_key", "action_group")
-        if "payload" not in data:
+        self.controller.log("MQTT data event: %s", data, level="DEBUG")
+        action_key = self.kwargs.get("action_key", DEFAULT_ACTION_KEY)
+        payload = _load_payload(data, action_key)
+        if payload is None:
+            self.controller.log(
+                "There is no `%s` in the MQTT topic payload", action_key, level="DEBUG"
+            )
             return
-        payload = json.loads(data["payload"])
+        await self.payload_callback(payload)
+
+    async def payload_callback(self, payload: dict[str, Any]) -> None:
+        action_key = self.kwargs.get("action_key", DEFAULT_ACTION_KEY)
+        action_group_key = self.kwargs.get("action_group_key", "action_group")
         if action_key not in payload:
             self.controller.log(
-                f"There is no `{action_key}` in the MQTT topic payload",
-                level="DEBUG",
+                "There is no `%s` in the MQTT topic payload", action_key, level="DEBUG"
             )
             return
         if action_group_key in payload and "action_group" in self.kwargs:
@@ -1,9 +1,17 @@
+from functools import partial
 from typing import Any
 
 from appdaemon.plugins.hass.hassapi import Hass
 from cx_const import DefaultActionsMapping
+from cx_core.event_hub import get_event_hub, listen_hass_event
 from cx_core.integration import EventData, Integration
 
+DEFAULT_SHARED_LISTENER = False
+
+
+def _get_device_ieee(data: EventData) -> str | None:
+    return data.get("device_ieee")
+
 
 class ZHAIntegration(Integration):
     name = "zha"
@@ -12,6 +20,19 @@ class ZHAIntegration(Integration):
         return self.controller.get_zha_actions_mapping()
 
     async def listen_changes(self, controller_id: str) -> None:
+        if self.kwargs.get("shared_listener", DEFAULT_SHARED_LISTENER):
+            # One hub for each namespace, since it listens in the namespace of its owner
+            event_hub = get_event_hub(
+                f"zha_event:{self.controller.namespace}",
+                listen_hass_event("zha_event"),
+                _get_device_ieee,
+            )
+            await event_hub.register(
+                self.controller,
+                controller_id,
+                partial(self.event_callback, "zha_event", kwargs={}),
+            )
+            return
         await Hass.listen_event(
             self.controller, self.event_callback, "zha_event", device_ieee=controller_id
         )
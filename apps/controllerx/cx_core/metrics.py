@@ -0,0 +1,217 @@
+import asyncio
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from appdaemon.plugins.hass.hassapi import Hass
+from cx_const import ActionEvent
+
+if TYPE_CHECKING:
+    from cx_core.controller import Controller
+
+DEFAULT_METRICS_INTERVAL = 60  # In seconds
+
+# Upper bounds of the histogram buckets in milliseconds
+BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+STAGE_QUEUE = "queue"
+STAGE_TEMPLATE = "template"
+STAGE_STATE = "state"
+STAGE_SERVICE = "service"
+STAGE_PUBLISH_HA = "publish_ha"
+STAGE_PUBLISH_MQTT = "publish_mqtt"
+STAGE_TOTAL = "total"
+
+# Keys accepted by the `metrics` attribute
+METRICS_ARGS = ["sensor", "prometheus_file", "interval"]
+
+# Action running in the current task, and when its event was received
+_current_action: ContextVar[str | None] = ContextVar("current_action", default=None)
+_event_time: ContextVar[float | None] = ContextVar("event_time", default=None)
+
+
+# Label values escape backslashes, quotes and newlines in the Prometheus format
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    counts: list[int]
+    count: int
+    total: float
+    max: float
+
+    def __init__(self) -> None:
+        # The last bucket is for values bigger than the last bound
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def observe(self, value: float) -> None:
+        idx = next(
+            (idx for idx, bound in enumerate(BUCKETS) if value <= bound), len(BUCKETS)
+        )
+        self.counts[idx] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percentile: float) -> float:
+        """
+        It returns the upper bound of the bucket where the percentile falls,
+        or the maximum value if it falls above the last bound.
+        """
+        if self.count == 0:
+            return 0
+        target = self.count * percentile / 100
+        accumulated = 0
+        for idx, count in enumerate(self.counts):
+            accumulated += count
+            if accumulated >= target:
+                break
+        return BUCKETS[idx] if idx < len(BUCKETS) else self.max
+
+
+class ActionMetrics:
+    """
+    It aggregates how long each action takes in each stage (waiting to run,
+    rendering templates, reading states and calling services) and exports it
+    to a Home Assistant sensor and/or a Prometheus text file.
+    """
+
+    controller: "Controller"
+    name: str
+    sensor: str | None
+    prometheus_file: str | None
+    interval: float
+    histograms: dict[tuple[str, str], Histogram]
+    _last_export: float
+
+    def __init__(
+        self,
+        controller: "Controller",
+        name: str,
+        sensor: str | None = None,
+        prometheus_file: str | None = None,
+        interval: float = DEFAULT_METRICS_INTERVAL,
+    ) -> None:
+        if sensor is None and prometheus_file is None:
+            raise ValueError("`metrics` needs either `sensor` or `prometheus_file`")
+        self.controller = controller
+        self.name = name
+        self.sensor = sensor
+        self.prometheus_file = prometheus_file
+        self.interval = interval
+        self.histograms = {}
+        self._last_export = 0
+
+    def event_received(self) -> None:
+        _event_time.set(time.perf_counter())
+
+    def get_event_time(self) -> float | None:
+        return _event_time.get()
+
+    def set_event_time(self, event_time: float | None) -> None:
+        """
+        It restores the event time in callbacks that do not run in the
+        context of the event, e.g. the ones scheduled with `run_in`.
+        """
+        _event_time.set(event_time)
+
+    def action_started(self, action_key: ActionEvent) -> None:
+        _current_action.set(str(action_key))
+        event_time = _event_time.get()
+        if event_time is not None:
+            self.observe(STAGE_QUEUE, time.perf_counter() - event_time)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        action = _current_action.get()
+        if action is None:
+            return
+        histogram = self.histograms.get((action, stage))
+        if histogram is None:
+            histogram = self.histograms[(action, stage)] = Histogram()
+        histogram.observe(seconds * 1000)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    async def action_finished(self) -> None:
+        event_time = _event_time.get()
+        if event_time is not None:
+            self.observe(STAGE_TOTAL, time.perf_counter() - event_time)
+        now = time.monotonic()
+        if now - self._last_export >= self.interval:
+            self._last_export = now
+            try:
+                await self.export()
+            except Exception as e:
+                # Metrics must not break the action
+                self.controller.log(
+                    "Metrics could not be exported: %s", e, level="WARNING"
+                )
+
+    def to_attributes(self) -> dict[str, Any]:
+        attributes: dict[str, Any] = {}
+        for (action, stage), histogram in sorted(self.histograms.items()):
+            attributes.setdefault(action, {})[stage] = {
+                "count": histogram.count,
+                "avg_ms": round(histogram.total / histogram.count, 3),
+                "p50_ms": histogram.percentile(50),
+                "p99_ms": histogram.percentile(99),
+            }
+        return attributes
+
+    def to_prometheus(self) -> str:
+        metric = "controllerx_action_stage_duration_seconds"
+        lines = [
+            f"# HELP {metric} Time spent by ControllerX actions in each stage.",
+            f"# TYPE {metric} histogram",
+        ]
+        for (action, stage), histogram in sorted(self.histograms.items()):
+            labels = (
+                f'controller="{_escape_label(self.name)}",'
+                f'action="{_escape_label(action)}",stage="{stage}"'
+            )
+            accumulated = 0
+            for bound, count in zip(BUCKETS, histogram.counts):
+                accumulated += count
+                lines.append(
+                    f'{metric}_bucket{{{labels},le="{bound / 1000}"}} {accumulated}'
+                )
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{metric}_sum{{{labels}}} {histogram.total / 1000}")
+            lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def _write_prometheus_file(self, path: str, content: str) -> None:
+        # Written to a temporary file first, so the file is never read half written
+        with open(f"{path}.tmp", "w") as f:
+            f.write(content)
+        os.replace(f"{path}.tmp", path)
+
+    async def export(self) -> None:
+        if self.sensor is not None:
+            await Hass.set_state(
+                self.controller,
+                self.sensor,
+                state=sum(
+                    histogram.count
+                    for (_, stage), histogram in self.histograms.items()
+                    if stage == STAGE_TOTAL
+                ),
+                attributes=self.to_attributes(),
+            )
+        if self.prometheus_file is not None:
+            await asyncio.to_thread(
+                self._write_prometheus_file, self.prometheus_file, self.to_prometheus()
+            )
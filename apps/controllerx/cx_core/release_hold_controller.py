@@ -1,4 +1,5 @@
 import abc
+import asyncio
 from typing import Any
 
 from cx_core import Controller, action
@@ -15,6 +16,10 @@ class ReleaseHoldController(Controller, abc.ABC):
     max_loops: int
     hold_release_toggle: bool
     release_delay: int
+    # Number of steps the current hold loop needs to apply, it is higher
+    # than 1 when the previous ones were not run in time.
+    hold_loop_steps: int = 1
+    hold_tick_rate: float | None = None
 
     async def init(self) -> None:
         self.on_hold = False
@@ -30,26 +35,68 @@ class ReleaseHoldController(Controller, abc.ABC):
     async def release(self) -> None:
         if self.release_delay > 0:
             await self.sleep(self.release_delay)
+        self.release_hold()
+
+    def release_hold(self) -> None:
+        """
+        It stops the running hold action, either from the `release` action
+        or from a second hold when `hold_release_toggle` is enabled.
+        """
         self.on_hold = False
 
     async def hold(self, *args: Any) -> None:
+        """
+        It calls `hold_loop` every `delay` milliseconds. The ticks are scheduled
+        with absolute deadlines on the event loop clock, so the time spent on
+        each `hold_loop` does not delay the following ones. If the loop falls
+        behind, the missed ticks are merged into the next `hold_loop` call
+        through `hold_loop_steps`.
+        """
+        loop = asyncio.get_running_loop()
+        period = self.delay / 1000
         loops = 0
+        ticks = 0
+        merged = 0
         self.on_hold = True
+        self.hold_loop_steps = 1
         stop = False
+        start = deadline = loop.time()
         while self.on_hold and not stop:
             stop = await self.hold_loop(*args)
+            ticks += 1
+            loops += self.hold_loop_steps
             # Stop the iteration if we either stop from the hold_loop
             # or we reached the max loop number
-            stop = stop or loops >= self.max_loops
-            await self.sleep(self.delay / 1000)
-            loops += 1
+            stop = stop or loops > self.max_loops
+            deadline += period
+            now = loop.time()
+            missed = int((now - deadline) // period) if period > 0 else 0
+            if missed > 0:
+                deadline += missed * period
+                merged += missed
+            self.hold_loop_steps = 1 + max(missed, 0)
+            await self.sleep(max(deadline - now, 0))
         self.on_hold = False
+        self.hold_loop_steps = 1
+        elapsed = loop.time() - start
+        if elapsed > 0:
+            self.hold_tick_rate = ticks / elapsed
+            self.log(
+                "🕒 Hold loop ran %s time(s) in %.2f seconds "
+                "(%.2f per second, %s merged step(s))",
+                ticks,
+                elapsed,
+                self.hold_tick_rate,
+                merged,
+                level="DEBUG",
+                ascii_encode=False,
+            )
 
     async def before_action(self, action: str, *args: Any, **kwargs: Any) -> bool:
         super_before_action = await super().before_action(action, *args, **kwargs)
         to_return = not (action == "hold" and self.on_hold)
         if action == "hold" and self.on_hold and self.hold_release_toggle:
-            self.on_hold = False
+            self.release_hold()
         return super_before_action and to_return
 
     @abc.abstractmethod
@@ -0,0 +1,106 @@
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+DEFAULT_MAX_IN_FLIGHT = 1
+
+# Attributes that do not make a call different from a previous one
+IGNORED_ATTRIBUTES = {"entity_id", "transition"}
+
+Send = Callable[..., Awaitable[Any]]
+CallKey = tuple[str, frozenset[str]]
+PendingCall = tuple[Send, str, dict[str, Any], "asyncio.Future[Any]"]
+
+
+class ServiceCallQueue:
+    """
+    It keeps a queue of service calls per entity, so only `max_in_flight` calls
+    are sent at the same time for each entity. If a call for the same entity,
+    service and attributes is still waiting to be sent, it gets replaced by the
+    new one, since only the latest state is relevant. The queue is shared by
+    all the controllers (see `get_service_queue`), so the calls of several
+    controllers holding the same light get coalesced together.
+    """
+
+    max_in_flight: int
+    _pending: dict[str, "OrderedDict[CallKey, PendingCall]"]
+    _in_flight: dict[str, int]
+    _tasks: set["asyncio.Task[None]"]
+
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> None:
+        if max_in_flight < 1:
+            raise ValueError("`max_in_flight` must be at least 1")
+        self.max_in_flight = max_in_flight
+        self._pending = {}
+        self._in_flight = {}
+        self._tasks = set()
+
+    @staticmethod
+    def get_key(service: str, attributes: dict[str, Any]) -> CallKey:
+        return (service, frozenset(attributes) - IGNORED_ATTRIBUTES)
+
+    async def call(self, send: Send, service: str, **attributes: Any) -> Any | None:
+        """
+        It sends the call with `send` once there is room for it, and returns
+        its result. It returns None if the call got replaced by a newer one.
+        """
+        entity_id = attributes.get("entity_id")
+        if not isinstance(entity_id, str):
+            return await send(service, **attributes)
+        pending = self._pending.setdefault(entity_id, OrderedDict())
+        key = ServiceCallQueue.get_key(service, attributes)
+        superseded = pending.pop(key, None)
+        if superseded is not None and not superseded[3].done():
+            superseded[3].set_result(None)
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        pending[key] = (send, service, attributes, future)
+        self._dispatch(entity_id)
+        return await future
+
+    def _dispatch(self, entity_id: str) -> None:
+        pending = self._pending[entity_id]
+        while pending and self._in_flight.get(entity_id, 0) < self.max_in_flight:
+            _, (send, service, attributes, future) = pending.popitem(last=False)
+            if future.done():
+                # The caller was cancelled before the call was sent
+                continue
+            self._in_flight[entity_id] = self._in_flight.get(entity_id, 0) + 1
+            task = asyncio.ensure_future(
+                self._send(entity_id, send, service, attributes, future)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(
+        self,
+        entity_id: str,
+        send: Send,
+        service: str,
+        attributes: dict[str, Any],
+        future: "asyncio.Future[Any]",
+    ) -> None:
+        try:
+            result = await send(service, **attributes)
+            if not future.done():
+                future.set_result(result)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        finally:
+            self._in_flight[entity_id] -= 1
+            self._dispatch(entity_id)
+
+
+_service_queues: dict[int, ServiceCallQueue] = {}
+
+
+def get_service_queue(max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> ServiceCallQueue:
+    """
+    It returns the queue shared by all the controllers running in the same
+    AppDaemon process with the same `max_in_flight`.
+    """
+    service_queue = _service_queues.get(max_in_flight)
+    if service_queue is None:
+        service_queue = _service_queues[max_in_flight] = ServiceCallQueue(max_in_flight)
+    return service_queue
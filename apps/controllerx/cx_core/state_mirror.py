@@ -0,0 +1,74 @@
+import time
+from typing import TYPE_CHECKING, Any
+
+from appdaemon.plugins.hass.hassapi import Hass
+
+if TYPE_CHECKING:
+    from cx_core.controller import Controller
+
+DEFAULT_STATE_MIRROR_MAX_AGE = 60  # In seconds
+
+
+class StateMirror:
+    """
+    It keeps a local copy of the entities states, which is kept up to date
+    with `listen_state` subscriptions. States older than `max_age` seconds
+    are read again from AppDaemon in case an update was missed.
+    """
+
+    controller: "Controller"
+    max_age: float
+    _states: dict[str, tuple[float, dict[str, Any] | None]]
+    _subscribed_entities: set[str]
+
+    def __init__(
+        self, controller: "Controller", max_age: float = DEFAULT_STATE_MIRROR_MAX_AGE
+    ) -> None:
+        self.controller = controller
+        self.max_age = max_age
+        self._states = {}
+        self._subscribed_entities = set()
+
+    async def _subscribe(self, entity_id: str) -> None:
+        if entity_id in self._subscribed_entities:
+            return
+        self._subscribed_entities.add(entity_id)
+        await Hass.listen_state(
+            self.controller, self.state_callback, entity_id, attribute="all"
+        )
+
+    async def _get_full_state(self, entity_id: str) -> dict[str, Any] | None:
+        now = time.monotonic()
+        cached = self._states.get(entity_id)
+        if cached is not None and now - cached[0] <= self.max_age:
+            return cached[1]
+        await self._subscribe(entity_id)
+        state: dict[str, Any] | None = await self.controller.get_state(
+            entity_id, attribute="all"
+        )
+        self._states[entity_id] = (now, state)
+        return state
+
+    async def get_state(self, entity_id: str, attribute: str | None = None) -> Any:
+        state = await self._get_full_state(entity_id)
+        if state is None:
+            return None
+        # Same lookup as AppDaemon's `get_state`
+        if attribute is None:
+            return state.get("state")
+        if attribute == "all":
+            return state
+        attributes: dict[str, Any] = state.get("attributes", {})
+        if attribute in attributes:
+            return attributes[attribute]
+        return state.get(attribute)
+
+    async def state_callback(
+        self,
+        entity: str,
+        attribute: str | None,
+        old: dict[str, Any] | None,
+        new: dict[str, Any] | None,
+        kwargs: dict[str, Any],
+    ) -> None:
+        self._states[entity] = (time.monotonic(), new)
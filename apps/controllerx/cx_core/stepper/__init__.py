@@ -106,6 +106,20 @@ class Stepper(abc.ABC):
         """
         raise NotImplementedError
 
+    def step_many(self, value: Number, direction: str, steps: int) -> StepperOutput:
+        """
+        It applies `steps` consecutive steps at once, stopping earlier
+        if the stepper reaches the end.
+        """
+        stepper_output = self.step(value, direction)
+        for _ in range(steps - 1):
+            if stepper_output.next_direction is None:
+                break
+            stepper_output = self.step(
+                stepper_output.next_value, stepper_output.next_direction
+            )
+        return stepper_output
+
 
 class InvertStepper(Stepper):
     def step(self, value: Number, direction: str) -> StepperOutput:
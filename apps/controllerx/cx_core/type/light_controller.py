@@ -1,9 +1,17 @@
 import asyncio
+import time
+from dataclasses import dataclass, field
 from functools import lru_cache
 from typing import Any, Literal
 
 from cx_const import Light, Number, PredefinedActionsMapping, StepperDir, StepperMode
-from cx_core.color_helper import Color, get_color_wheel
+from cx_core.color_helper import (
+    Color,
+    ColorWheel,
+    get_color_gamut,
+    get_color_wheel,
+    get_color_wheel_lut,
+)
 from cx_core.controller import action
 from cx_core.feature_support.light import LightSupport
 from cx_core.integration import EventData
@@ -13,7 +21,6 @@ from cx_core.integration.zha import ZHAIntegration
 from cx_core.release_hold_controller import ReleaseHoldController
 from cx_core.stepper import MinMax, Stepper
 from cx_core.stepper.bounce_stepper import BounceStepper
-from cx_core.stepper.index_loop_stepper import IndexLoopStepper
 from cx_core.stepper.loop_stepper import LoopStepper
 from cx_core.stepper.stop_stepper import StopStepper
 from cx_core.type_controller import Entity, TypeController
@@ -30,6 +37,18 @@ DEFAULT_TRANSITION = 300
 DEFAULT_ADD_TRANSITION = True
 DEFAULT_TRANSITION_TURN_TOGGLE = False
 DEFAULT_HOLD_TOGGLE_DIRECTION_INIT = "up"
+DEFAULT_PREDICT_VALUE = False
+DEFAULT_PREDICT_VALUE_MARGIN = 1000  # In milliseconds
+DEFAULT_GROUP_FANOUT = "group"
+DEFAULT_GROUP_FANOUT_MAX_PARALLEL = 8
+DEFAULT_COLOR_WHEEL_RESOLUTION = 1
+DEFAULT_HOLD_MODE = "loop"
+
+GROUP_FANOUT_GROUP = "group"
+GROUP_FANOUT_PARALLEL = "parallel"
+
+HOLD_MODE_LOOP = "loop"
+HOLD_MODE_RAMP = "ramp"
 
 ColorMode = Literal["auto", "xy_color", "color_temp"]
 
@@ -54,6 +73,55 @@ class LightEntity(Entity):
         self.color_mode = color_mode
 
 
+class PredictedValues:
+    """
+    It keeps the last values sent to the light (and whether it was turned on
+    or off) until the transition finishes plus a margin, since Home Assistant
+    state might not be updated yet until then.
+    """
+
+    margin: float
+    _values: dict[str | None, tuple[float, Any]]
+
+    def __init__(self, margin: float) -> None:
+        self.margin = margin
+        self._values = {}
+
+    def set(self, attribute: str | None, value: Any, transition: float = 0) -> None:
+        valid_until = time.monotonic() + transition + self.margin
+        self._values[attribute] = (valid_until, value)
+
+    def get(self, attribute: str | None) -> Any | None:
+        predicted = self._values.get(attribute)
+        if predicted is None or predicted[0] < time.monotonic():
+            return None
+        return predicted[1]
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+@dataclass
+class PlannedRamp:
+    """
+    Transition sent to the light by a hold in `ramp` mode. The value of
+    the light is estimated linearly from the time passed since it started.
+    """
+
+    attribute: str
+    start_value: float
+    end_value: float
+    start_time: float
+    duration: float
+    released: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def value_at(self, now: float) -> float:
+        if self.duration <= 0:
+            return self.end_value
+        fraction = max(0, min((now - self.start_time) / self.duration, 1))
+        return self.start_value + (self.end_value - self.start_value) * fraction
+
+
 class LightController(TypeController[LightEntity], ReleaseHoldController):
     """
     This is the main class that controls the lights for different devices.
@@ -87,7 +155,13 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
         ATTRIBUTE_XY_COLOR,
     ]
 
-    index_color = 0
+    PREDICTED_ATTRIBUTES = [
+        ATTRIBUTE_BRIGHTNESS,
+        ATTRIBUTE_WHITE_VALUE,
+        ATTRIBUTE_COLOR_TEMP,
+    ]
+
+    index_color: int = 0
     value_attribute = None
 
     # These are intermediate variables to store the checked value
@@ -102,7 +176,13 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
     domains = ["light"]
     entity_arg = "light"
 
+    color_wheel: ColorWheel
     _supported_color_modes: set[str] | None
+    predicted_values: PredictedValues | None = None
+    group_fanout: str = DEFAULT_GROUP_FANOUT
+    group_fanout_semaphore: asyncio.Semaphore | None = None
+    hold_mode: str = DEFAULT_HOLD_MODE
+    ramp: PlannedRamp | None = None
 
     async def init(self) -> None:
         self.manual_steps = self.args.get("manual_steps", DEFAULT_MANUAL_STEPS)
@@ -124,8 +204,10 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
         }
 
         self.transition = self.args.get("transition", DEFAULT_TRANSITION)
-        self.color_wheel = get_color_wheel(
-            self.args.get("color_wheel", "default_color_wheel")
+        self.color_wheel = get_color_wheel_lut(
+            get_color_wheel(self.args.get("color_wheel", "default_color_wheel")),
+            self.args.get("color_wheel_resolution", DEFAULT_COLOR_WHEEL_RESOLUTION),
+            get_color_gamut(self.args.get("color_gamut")),
         )
         self._supported_color_modes = self.args.get("supported_color_modes")
 
@@ -143,6 +225,27 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
             [StepperDir.UP, StepperDir.DOWN],
             "`hold_toggle_direction_init`",
         )
+        if self.args.get("predict_value", DEFAULT_PREDICT_VALUE):
+            self.predicted_values = PredictedValues(
+                self.args.get("predict_value_margin", DEFAULT_PREDICT_VALUE_MARGIN)
+                / 1000
+            )
+        self.group_fanout = self.get_option(
+            self.args.get("group_fanout", DEFAULT_GROUP_FANOUT),
+            [GROUP_FANOUT_GROUP, GROUP_FANOUT_PARALLEL],
+            "`group_fanout`",
+        )
+        if self.group_fanout == GROUP_FANOUT_PARALLEL:
+            self.group_fanout_semaphore = asyncio.Semaphore(
+                self.args.get(
+                    "group_fanout_max_parallel", DEFAULT_GROUP_FANOUT_MAX_PARALLEL
+                )
+            )
+        self.hold_mode = self.get_option(
+            self.args.get("hold_mode", DEFAULT_HOLD_MODE),
+            [HOLD_MODE_LOOP, HOLD_MODE_RAMP],
+            "`hold_mode`",
+        )
         await super().init()
 
     def _get_entity_type(self) -> type[LightEntity]:
@@ -445,7 +548,80 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
             attributes["transition"] = self.transition / 1000
         if self.remove_transition_check and not force_transition:
             del attributes["transition"]
-        await self.call_service(service, entity_id=self.entity.name, **attributes)
+        if (
+            self.group_fanout_semaphore is not None
+            and self.entity.is_group
+            # A group toggle turns all lights on or off, unlike toggling each one
+            and service != "light/toggle"
+        ):
+            await self.call_group_members_service(
+                self.group_fanout_semaphore, service, **attributes
+            )
+        else:
+            await self.call_service(service, entity_id=self.entity.name, **attributes)
+        if self.predicted_values is not None:
+            self.predict_values(self.predicted_values, service, attributes)
+
+    async def call_group_members_service(
+        self, semaphore: asyncio.Semaphore, service: str, **attributes: Any
+    ) -> None:
+        """
+        It calls the service for each light of the group at the same time
+        (up to `group_fanout_max_parallel`), instead of letting Home Assistant
+        call them one after the other.
+        """
+
+        async def call_member(entity_id: str) -> None:
+            async with semaphore:
+                await self.call_service(service, entity_id=entity_id, **attributes)
+
+        results = await asyncio.gather(
+            *(call_member(entity_id) for entity_id in self.entity.entities),
+            return_exceptions=True,
+        )
+        for entity_id, result in zip(self.entity.entities, results):
+            if isinstance(result, Exception):
+                self.log(
+                    "`%s` could not be called for `%s`: %s",
+                    service,
+                    entity_id,
+                    result,
+                    level="WARNING",
+                )
+
+    def predict_values(
+        self,
+        predicted_values: PredictedValues,
+        service: str,
+        attributes: dict[str, Any],
+    ) -> None:
+        if self.contains_templating(self.entity.name):
+            # The entity might be a different one next time
+            return
+        transition: float = attributes.get("transition", 0)
+        if service == "light/turn_on":
+            predicted_values.set(None, "on", transition)
+            for attribute in LightController.PREDICTED_ATTRIBUTES:
+                if attribute in attributes:
+                    predicted_values.set(attribute, attributes[attribute], transition)
+        elif service == "light/turn_off":
+            predicted_values.clear()
+            predicted_values.set(None, "off", transition)
+        else:
+            # The outcome of a toggle depends on the state of the light
+            predicted_values.clear()
+
+    async def get_predicted_entity_state(self, attribute: str | None = None) -> Any:
+        """
+        It returns the value ControllerX sent for the attribute (or the state
+        if no attribute is passed) if Home Assistant might still be outdated,
+        otherwise it reads it from the entity.
+        """
+        if self.predicted_values is not None:
+            value = self.predicted_values.get(attribute)
+            if value is not None:
+                return value
+        return await self.get_entity_state(attribute=attribute)
 
     async def _on(self, **attributes: Any) -> None:
         await self.call_light_service("light/turn_on", **attributes)
@@ -521,7 +697,8 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
         light_state: str
         attribute_value: Number
         light_state, attribute_value = await asyncio.gather(
-            self.get_entity_state(), self.get_entity_state(attribute=attribute)
+            self.get_predicted_entity_state(),
+            self.get_predicted_entity_state(attribute=attribute),
         )
 
         if light_state == "off" or attribute_value != default:
@@ -699,7 +876,8 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
     ) -> Stepper:
         previous_direction = Stepper.invert_direction(self.hold_toggle_direction_init)
         if attribute == LightController.ATTRIBUTE_XY_COLOR:
-            return IndexLoopStepper(
+            return LoopStepper(
+                MinMax(0, len(self.color_wheel)),
                 len(self.color_wheel),
                 previous_direction,
                 relative_steps,
@@ -748,7 +926,7 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
             or attribute == LightController.ATTRIBUTE_WHITE_VALUE
             or attribute == LightController.ATTRIBUTE_COLOR_TEMP
         ):
-            value = await self.get_entity_state(attribute=attribute)
+            value = await self.get_predicted_entity_state(attribute=attribute)
             if value is None:
                 raise ValueError(
                     f"Value for `{attribute}` attribute could not be retrieved "
@@ -790,7 +968,7 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
                 raise ValueError(
                     f"`attribute` and `direction` are mandatory fields for `{action}` action"
                 )
-            light_state = await self.get_entity_state()
+            light_state = await self.get_predicted_entity_state()
             self.smooth_power_on_check = self.check_smooth_power_on(
                 attribute, direction, light_state
             )
@@ -799,7 +977,7 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
             )
             to_return = (light_state == "on") or self.smooth_power_on_check
         elif action == "attribute_from_controller_step":
-            light_state = await self.get_entity_state()
+            light_state = await self.get_predicted_entity_state()
             to_return = light_state == "on"
             self.smooth_power_on_check = False
             self.remove_transition_check = False
@@ -869,7 +1047,8 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
         attribute = await self.get_attribute(attribute)
         self.value_attribute = await self.get_value_attribute(attribute)
         self.log(
-            f"Attribute value before running the hold action: {self.value_attribute}",
+            "Attribute value before running the hold action: %s",
+            self.value_attribute,
             level="DEBUG",
         )
         stepper = self.get_stepper(
@@ -877,12 +1056,67 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
         )
         if direction == StepperDir.TOGGLE:
             self.log(
-                f"Previous direction: {stepper.previous_direction}",
-                level="DEBUG",
+                "Previous direction: %s", stepper.previous_direction, level="DEBUG"
             )
         direction = stepper.get_direction(self.value_attribute, direction)
-        self.log(f"Going direction: {direction}", level="DEBUG")
-        await super().hold(attribute, direction, stepper)
+        self.log("Going direction: %s", direction, level="DEBUG")
+        if (
+            self.hold_mode == HOLD_MODE_RAMP
+            and mode == StepperMode.STOP
+            and attribute != LightController.ATTRIBUTE_XY_COLOR
+            and not self.smooth_power_on_check
+            and not self.remove_transition_check
+        ):
+            await self.hold_ramp(attribute, direction, stepper)
+        else:
+            await super().hold(attribute, direction, stepper)
+
+    async def hold_ramp(self, attribute: str, direction: str, stepper: Stepper) -> None:
+        """
+        It sends a single `light/turn_on` with the end value of the stepper and a
+        transition as long as the hold loop would take to get there. When the hold
+        is released, the light is stopped at its estimated current value.
+        """
+        if self.value_attribute is None:
+            return
+        min_max = stepper.min_max
+        step = (min_max.max - min_max.min) / stepper.steps
+        end_value = min_max.max if direction == StepperDir.UP else min_max.min
+        # Same limit as the hold loop, which stops after `max_loops` steps
+        distance = min(abs(end_value - self.value_attribute), step * self.max_loops)
+        if distance == 0:
+            return
+        end_value = self.value_attribute + Stepper.apply_sign(distance, direction)
+        duration = distance / step * self.delay / 1000
+        loop = asyncio.get_running_loop()
+        ramp = PlannedRamp(
+            attribute, self.value_attribute, end_value, loop.time(), duration
+        )
+        self.ramp = ramp
+        self.on_hold = True
+        try:
+            await self._on(**{attribute: round(end_value), "transition": duration})
+            await asyncio.wait_for(ramp.released.wait(), duration)
+        except asyncio.TimeoutError:
+            self.value_attribute = round(end_value)
+        else:
+            value = round(ramp.value_at(loop.time()))
+            self.log(
+                "Stopping `%s` at the estimated value: %s",
+                attribute,
+                value,
+                level="DEBUG",
+            )
+            await self._on(**{attribute: value, "transition": 0})
+            self.value_attribute = value
+        finally:
+            self.on_hold = False
+            self.ramp = None
+
+    def release_hold(self) -> None:
+        super().release_hold()
+        if self.ramp is not None:
+            self.ramp.released.set()
 
     async def hold_loop(
         self,
@@ -899,6 +1133,7 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
             direction,
             stepper,
             extra_attributes=extra_attributes,
+            steps=self.hold_loop_steps,
         )
 
     async def change_light_state(
@@ -909,6 +1144,7 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
         stepper: Stepper,
         *,
         extra_attributes: dict[str, Any] | None = None,
+        steps: int = 1,
     ) -> bool:
         """
         This functions changes the state of the light depending on the previous
@@ -920,7 +1156,7 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
         )
         direction = self.next_direction or direction
         if attribute == LightController.ATTRIBUTE_XY_COLOR:
-            stepper_output = stepper.step(self.index_color, direction)
+            stepper_output = stepper.step_many(self.index_color, direction, steps)
             self.index_color = int(stepper_output.next_value)
             xy_color = self.color_wheel[self.index_color]
             attributes[attribute] = list(xy_color)
@@ -934,7 +1170,7 @@ class LightController(TypeController[LightEntity], ReleaseHoldController):
             await self._on_min(attribute)
             # # After smooth power on, the light should not brighten up.
             return True
-        stepper_output = stepper.step(old, direction)
+        stepper_output = stepper.step_many(old, direction, steps)
         self.next_direction = stepper_output.next_direction
         next_value = int(stepper_output.next_value)
         attributes[attribute] = next_value
@@ -172,9 +172,11 @@ class MediaPlayerController(TypeController[Entity], ReleaseHoldController):
         if volume_level is not None:
             self.volume_level = volume_level
 
-    async def volume_change(self, direction: str) -> bool:
+    async def volume_change(self, direction: str, steps: int = 1) -> bool:
         if await self.feature_support.is_supported(MediaPlayerSupport.VOLUME_SET):
-            stepper_output = self.volume_stepper.step(self.volume_level, direction)
+            stepper_output = self.volume_stepper.step_many(
+                self.volume_level, direction, steps
+            )
             self.volume_level = stepper_output.next_value
             await self.volume_set(self.volume_level)
             return stepper_output.exceeded
@@ -190,7 +192,7 @@ class MediaPlayerController(TypeController[Entity], ReleaseHoldController):
             return False
 
     async def hold_loop(self, direction: str) -> bool:
-        return await self.volume_change(direction)
+        return await self.volume_change(direction, self.hold_loop_steps)
 
     def default_delay(self) -> int:
         return 500
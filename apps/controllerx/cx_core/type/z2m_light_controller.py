@@ -1,12 +1,15 @@
+import asyncio
 import json
 from collections.abc import Awaitable, Callable
 from functools import lru_cache
 from typing import Annotated, Any, Literal
 
+from appdaemon.plugins.mqtt.mqttapi import Mqtt
 from cx_const import PredefinedActionsMapping, StepperDir, Z2MLight
 from cx_core.controller import Controller, action
 from cx_core.integration import EventData
 from cx_core.integration.z2m import Z2MIntegration
+from cx_core.metrics import STAGE_PUBLISH_HA, STAGE_PUBLISH_MQTT
 from cx_core.stepper import InvertStepper, MinMax
 from cx_core.type_controller import Entity, TypeController
 
@@ -16,12 +19,21 @@ DEFAULT_TRANSITION = 0.5
 DEFAULT_MODE = "ha"
 DEFAULT_TOPIC_PREFIX = "zigbee2mqtt"
 
-Mode = Annotated[str, Literal["ha", "mqtt"]]
+Mode = Annotated[str, Literal["ha", "mqtt", "auto"]]
+
+# Metrics stage of each way of publishing the MQTT messages
+PUBLISH_STAGES: dict[Mode, str] = {"ha": STAGE_PUBLISH_HA, "mqtt": STAGE_PUBLISH_MQTT}
 
 
 class Z2MLightEntity(Entity):
     mode: Mode
     topic_prefix: str
+    # Friendly names of the devices to control together, if any
+    devices: list[str] | None
+    # Zigbee2MQTT groups with the friendly names of their members
+    groups: dict[str, list[str]]
+    # Groups from the configuration, kept when the bridge groups change
+    config_groups: dict[str, list[str]]
 
     def __init__(
         self,
@@ -29,11 +41,36 @@ class Z2MLightEntity(Entity):
         entities: list[str] | None = None,
         mode: Mode = DEFAULT_MODE,
         topic_prefix: str = DEFAULT_TOPIC_PREFIX,
+        devices: list[str] | None = None,
+        groups: dict[str, list[str]] | None = None,
     ) -> None:
         super().__init__(name, entities)
-        mode = Controller.get_option(mode, ["ha", "mqtt"])
+        mode = Controller.get_option(mode, ["ha", "mqtt", "auto"])
         self.mode = mode
         self.topic_prefix = topic_prefix
+        self.devices = devices
+        self.config_groups = groups if groups is not None else {}
+        self.groups = dict(self.config_groups)
+
+    def set_bridge_groups(self, bridge_groups: dict[str, list[str]]) -> None:
+        """
+        It replaces the groups with the latest ones from Zigbee2MQTT, so
+        removed or changed groups are not used anymore.
+        """
+        self.groups = {**self.config_groups, **bridge_groups}
+
+    def get_targets(self) -> list[str]:
+        """
+        It returns the friendly names to send the messages to. A group with
+        the same devices is preferred, so a single message is sent.
+        """
+        if self.devices is None:
+            return [self.name]
+        devices = set(self.devices)
+        for group, members in self.groups.items():
+            if set(members) == devices:
+                return [group]
+        return self.devices
 
 
 class Z2MLightController(TypeController[Z2MLightEntity]):
@@ -68,6 +105,11 @@ class Z2MLightController(TypeController[Z2MLightEntity]):
     hold_attribute: str | None
 
     _mqtt_fn: dict[Mode, Callable[[str, str], Awaitable[None]]]
+    targets: list[str] | None = None
+    # Last `bridge/devices` (IEEE address to friendly name) and `bridge/groups`
+    # (group to members IEEE addresses) snapshots from Zigbee2MQTT
+    bridge_devices: dict[str, str] | None = None
+    bridge_groups: dict[str, list[str]] | None = None
 
     async def init(self) -> None:
         self.click_steps = self.args.get("click_steps", DEFAULT_CLICK_STEPS)
@@ -83,6 +125,29 @@ class Z2MLightController(TypeController[Z2MLightEntity]):
 
         await super().init()
 
+        if self.entity.mode == "auto":
+            # The MQTT plugin publishes straight to the broker, without going
+            # through Home Assistant, so it is used whenever it is available
+            self.entity.mode = "mqtt" if await self.namespace_exists("mqtt") else "ha"
+            self.log(
+                "Publishing Zigbee2MQTT messages through `%s`",
+                self.entity.mode,
+                level="DEBUG",
+            )
+
+        self.targets = self.entity.get_targets()
+        if self.entity.devices is not None and self.entity.mode == "mqtt":
+            for topic, callback in (
+                ("bridge/devices", self.bridge_devices_callback),
+                ("bridge/groups", self.bridge_groups_callback),
+            ):
+                await Mqtt.listen_event(
+                    self,
+                    callback,
+                    topic=f"{self.entity.topic_prefix}/{topic}",
+                    namespace="mqtt",
+                )
+
     def _get_entity_type(self) -> type[Z2MLightEntity]:
         return Z2MLightEntity
 
@@ -218,8 +283,65 @@ class Z2MLightController(TypeController[Z2MLightEntity]):
         )
 
     async def _mqtt_call(self, payload: dict[str, Any]) -> None:
-        await self._mqtt_fn[self.entity.mode](
-            f"{self.entity.topic_prefix}/{self.entity.name}/set", json.dumps(payload)
+        if self.metrics is not None:
+            with self.metrics.measure(PUBLISH_STAGES[self.entity.mode]):
+                await self._publish(json.dumps(payload))
+        else:
+            await self._publish(json.dumps(payload))
+
+    async def _publish(self, payload_str: str) -> None:
+        targets = self.targets if self.targets is not None else [self.entity.name]
+        mqtt_fn = self._mqtt_fn[self.entity.mode]
+        if len(targets) == 1:
+            await mqtt_fn(f"{self.entity.topic_prefix}/{targets[0]}/set", payload_str)
+            return
+        await asyncio.gather(
+            *(
+                mqtt_fn(f"{self.entity.topic_prefix}/{target}/set", payload_str)
+                for target in targets
+            )
+        )
+
+    async def bridge_devices_callback(
+        self, event_name: str, data: EventData, kwargs: dict[str, Any]
+    ) -> None:
+        if "payload" not in data:
+            return
+        self.bridge_devices = {
+            device["ieee_address"]: device["friendly_name"]
+            for device in json.loads(data["payload"])
+            if "ieee_address" in device and "friendly_name" in device
+        }
+        self.update_bridge_groups()
+
+    async def bridge_groups_callback(
+        self, event_name: str, data: EventData, kwargs: dict[str, Any]
+    ) -> None:
+        if "payload" not in data:
+            return
+        self.bridge_groups = {
+            group["friendly_name"]: [
+                member["ieee_address"] for member in group.get("members", [])
+            ]
+            for group in json.loads(data["payload"])
+            if "friendly_name" in group
+        }
+        self.update_bridge_groups()
+
+    def update_bridge_groups(self) -> None:
+        if self.bridge_devices is None or self.bridge_groups is None:
+            return
+        self.entity.set_bridge_groups(
+            {
+                group: [self.bridge_devices.get(member, member) for member in members]
+                for group, members in self.bridge_groups.items()
+            }
+        )
+        self.targets = self.entity.get_targets()
+        self.log(
+            "Zigbee2MQTT groups updated, sending messages to %s",
+            self.targets,
+            level="DEBUG",
         )
 
     async def _on(self, **attributes: Any) -> None:
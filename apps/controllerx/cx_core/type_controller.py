@@ -3,6 +3,7 @@ from typing import Any, Generic, TypeVar
 
 from cx_core.controller import Controller
 from cx_core.feature_support import FeatureSupport
+from cx_core.state_mirror import DEFAULT_STATE_MIRROR_MAX_AGE, StateMirror
 
 EntityVar = TypeVar("EntityVar", bound="Entity")
 
@@ -47,6 +48,7 @@ class TypeController(Controller, abc.ABC, Generic[EntityVar]):
     entity: EntityVar
     update_supported_features: bool
     feature_support: FeatureSupport
+    state_mirror: StateMirror | None = None
 
     async def init(self) -> None:
         if self.entity_arg not in self.args:
@@ -62,6 +64,11 @@ class TypeController(Controller, abc.ABC, Generic[EntityVar]):
         self.feature_support = FeatureSupport(
             self, supported_features, self.update_supported_features
         )
+        if self.args.get("state_mirror", False):
+            self.state_mirror = StateMirror(
+                self,
+                self.args.get("state_mirror_max_age", DEFAULT_STATE_MIRROR_MAX_AGE),
+            )
         await super().init()
 
     @abc.abstractmethod
@@ -129,5 +136,7 @@ class TypeController(Controller, abc.ABC, Generic[EntityVar]):
             entities = await self._get_entities(self.entity.name)
             self.entity.set_entities(entities)
             entity = self.entity.entities[0]
+        if self.state_mirror is not None and not self.contains_templating(entity):
+            return await self.state_mirror.get_state(entity, attribute=attribute)
         out = await self.get_state(entity, attribute=attribute)
         return out
@@ -0,0 +1,160 @@
+"""
+Index of the device classes and the module from `cx_devices` where they are
+defined, so `controllerx.py` only imports the modules for the classes in use.
+It needs to be updated when adding a new device (`devices_test.py` checks it).
+"""
+
+DEVICES_INDEX: dict[str, str] = {
+    "AdeoHRC99CZC045LightController": "adeo",
+    "AdeoHRC99CZC045Z2MLightController": "adeo",
+    "MFKZQ01LMLightController": "aqara",
+    "WXCJKG11LMLightController": "aqara",
+    "WXCJKG11LMZ2MLightController": "aqara",
+    "WXCJKG12LMLightController": "aqara",
+    "WXCJKG12LMZ2MLightController": "aqara",
+    "WXCJKG13LMLightController": "aqara",
+    "WXCJKG13LMMediaPlayerController": "aqara",
+    "WXCJKG13LMZ2MLightController": "aqara",
+    "WXKG01LMLightController": "aqara",
+    "WXKG01LMZ2MLightController": "aqara",
+    "WXKG02LMLightController": "aqara",
+    "WXKG02LMSwitchController": "aqara",
+    "WXKG02LMZ2MLightController": "aqara",
+    "WXKG06LMLightController": "aqara",
+    "WXKG06LMSwitchController": "aqara",
+    "WXKG07LMLightController": "aqara",
+    "WXKG07LMSwitchController": "aqara",
+    "WXKG07LMZ2MLightController": "aqara",
+    "WXKG11LMRemoteLightController": "aqara",
+    "WXKG11LMRemoteZ2MLightController": "aqara",
+    "WXKG11LMSensorSwitchLightController": "aqara",
+    "WXKG12LMLightController": "aqara",
+    "WXKG12LMZ2MLightController": "aqara",
+    "WXKG15LMLightController": "aqara",
+    "WXKG15LMSwitchController": "aqara",
+    "WXKG15LMZ2MLightController": "aqara",
+    "ZNXNKG02LMLightController": "aqara",
+    "ZNXNKG02LMMediaPlayerController": "aqara",
+    "AUA1ZBR2GWLightController": "aurora",
+    "HMPB2WM552LightController": "homematic",
+    "HMPB6WM55LightController": "homematic",
+    "HMPBI4FMLightController": "homematic",
+    "HMSenMDIRWM55LightController": "homematic",
+    "E1743Controller": "ikea",
+    "E1743CoverController": "ikea",
+    "E1743MediaPlayerController": "ikea",
+    "E1743SwitchController": "ikea",
+    "E1743Z2MLightController": "ikea",
+    "E1743Z2MSwitchController": "ikea",
+    "E1744LightController": "ikea",
+    "E1744MediaPlayerController": "ikea",
+    "E1744Z2MLightController": "ikea",
+    "E1766CoverController": "ikea",
+    "E1766LightController": "ikea",
+    "E1766SwitchController": "ikea",
+    "E1766Z2MLightController": "ikea",
+    "E1810Controller": "ikea",
+    "E1810MediaPlayerController": "ikea",
+    "E1810Z2MLightController": "ikea",
+    "E1812LightController": "ikea",
+    "E1812SwitchController": "ikea",
+    "E1812Z2MLightController": "ikea",
+    "E2002LightController": "ikea",
+    "E2002MediaPlayerController": "ikea",
+    "E2002Z2MLightController": "ikea",
+    "E2123MediaPlayerController": "ikea",
+    "E2201CoverController": "ikea",
+    "E2201LightController": "ikea",
+    "E2201MediaPlayerController": "ikea",
+    "E2201SwitchController": "ikea",
+    "E2201Z2MLightController": "ikea",
+    "E2213LightController": "ikea",
+    "E2213Z2MLightController": "ikea",
+    "ICTCG1Controller": "ikea",
+    "ICTCG1MediaPlayerController": "ikea",
+    "ICTCG1Z2MLightController": "ikea",
+    "W2049LightController": "ikea",
+    "W2049MediaPlayerController": "ikea",
+    "Legrand600083LightController": "legrand",
+    "Legrand600083Z2MLightController": "legrand",
+    "Legrand600088LeftLightController": "legrand",
+    "Legrand600088LeftZ2MLightController": "legrand",
+    "Legrand600088LightController": "legrand",
+    "Legrand600088RightLightController": "legrand",
+    "Legrand600088RightZ2MLightController": "legrand",
+    "Legrand600088Z2MLightController": "legrand",
+    "ZS23000278LightController": "linkind",
+    "ZS23000278Z2MLightController": "linkind",
+    "HG06323LightController": "livarno",
+    "HG06323Z2MLightController": "livarno",
+    "LZL4BWHL01LightController": "lutron",
+    "LutronPJ22BLightController": "lutron",
+    "LutronPJ22BMediaPlayerController": "lutron",
+    "LutronPJ22BRLLightController": "lutron",
+    "LutronPJ22BRLMediaPlayerController": "lutron",
+    "LutronPJ23BRLLightController": "lutron",
+    "LutronPJ23BRLMediaPlayerController": "lutron",
+    "LutronPJ24BLightController": "lutron",
+    "LutronPJ24BMediaPlayerController": "lutron",
+    "Z31BRLLightController": "lutron",
+    "Z31BRLZ2MLightController": "lutron",
+    "MLI404002Controller": "muller_licht",
+    "MLI404002LightController": "muller_licht",
+    "MLI404002Z2MLightController": "muller_licht",
+    "MLI404011LightController": "muller_licht",
+    "MLI404011Z2MLightController": "muller_licht",
+    "Namron4512773LightController": "namron",
+    "Namron4512773Z2MLightController": "namron",
+    "OsramAC025XX00NJLightController": "osram",
+    "HueDimmerController": "philips",
+    "HueDimmerZ2MLightController": "philips",
+    "HueSmartButtonLightController": "philips",
+    "HueSmartButtonZ2MLightController": "philips",
+    "PTM215XLightController": "philips",
+    "Philips929002398602LightController": "philips",
+    "Philips929002398602Z2MLightController": "philips",
+    "Philips929003017102LightController": "philips",
+    "Philips929003017102Z2MLightController": "philips",
+    "PhilipsRDM002LightController": "philips",
+    "PhilipsRDM002Z2MLightController": "philips",
+    "Prolight5412748727388LightController": "prolight",
+    "Prolight5412748727388Z2MLightController": "prolight",
+    "ZB3009LightController": "rgb_genie",
+    "ZB3009Z2MLightController": "rgb_genie",
+    "ZB5121LightController": "rgb_genie",
+    "ZB5122LightController": "rgb_genie",
+    "ROB2000070LightController": "robb",
+    "ROB2000070Z2MLightController": "robb",
+    "E1EG7FLightController": "sengled",
+    "E1EG7FZ2MLightController": "sengled",
+    "Shelly25LightController": "shelly",
+    "ShellyDimmer2LightController": "shelly",
+    "ShellyI3LightController": "shelly",
+    "ShellyPlusI4LightController": "shelly",
+    "SK5700002228949LightController": "smartkontakten",
+    "SmartThingsButtonLightController": "smartthings",
+    "SmartThingsButtonMediaPlayerController": "smartthings",
+    "SNZB01LightController": "sonoff",
+    "TasmotaButtonCoverController": "tasmota",
+    "TasmotaButtonLightController": "tasmota",
+    "TasmotaButtonSwitchController": "tasmota",
+    "TasmotaButtonZ2MLightController": "tasmota",
+    "TasmotaSwitchCoverController": "tasmota",
+    "TasmotaSwitchLightController": "tasmota",
+    "TasmotaSwitchSwitchController": "tasmota",
+    "TasmotaSwitchZ2MLightController": "tasmota",
+    "TerncyPP01LightController": "terncy",
+    "TerncySD01LightController": "terncy",
+    "TerncySD01MediaPlayerController": "terncy",
+    "ZYCT202LightController": "trust",
+    "ZYCT202MediaPlayerController": "trust",
+    "ZYCT202Z2MLightController": "trust",
+    "TS0042LightController": "tuya",
+    "TS0043CoverController": "tuya",
+    "TS0043LightController": "tuya",
+    "TS0044FLightController": "tuya",
+    "TS0044LightController": "tuya",
+    "TuYaERS10TZBVKAALightController": "tuya",
+    "TuYaERS10TZBVKAAMediaPlayerController": "tuya",
+    "TuYaERS10TZBVKAAZ2MLightController": "tuya",
+}
@@ -0,0 +1,53 @@
+"""
+Run the benchmarks with `python -m tests.benchmarks` from the root of the
+repository (with `apps/controllerx` in `PYTHONPATH`).
+"""
+
+import argparse
+import asyncio
+
+from tests.benchmarks.benchmark import (
+    FAN_OUT_CONTROLLERS,
+    SCENARIOS,
+    format_fan_out_results,
+    format_results,
+    run_fan_out,
+    run_scenario,
+)
+
+
+async def main(rounds: int, scenarios: list[str] | None, fan_out: list[int]) -> None:
+    results = [
+        await run_scenario(scenario, rounds)
+        for scenario in SCENARIOS
+        if scenarios is None or scenario.name in scenarios
+    ]
+    print(format_results(results))
+    if fan_out:
+        fan_out_results = [
+            await run_fan_out(controllers, rounds) for controllers in fan_out
+        ]
+        print()
+        print(format_fan_out_results(fan_out_results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ControllerX event benchmarks")
+    parser.add_argument(
+        "--rounds", type=int, default=500, help="Rounds of events per scenario"
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[scenario.name for scenario in SCENARIOS],
+        help="Scenario to run (all by default), it can be repeated",
+    )
+    parser.add_argument(
+        "--fan-out",
+        type=int,
+        nargs="*",
+        default=FAN_OUT_CONTROLLERS,
+        help="Number of Homematic controllers of each fan-out run (none to skip)",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.scenario, args.fan_out))
@@ -0,0 +1,279 @@
+import asyncio
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Any
+
+from cx_core import Controller
+
+from tests.benchmarks.fake_backend import FakeBackend
+from tests.test_utils import get_controller
+
+LIGHT = "light.livingroom"
+CONTROLLER_ID = "livingroom_controller"
+
+# Number of Homematic controllers of each fan-out run
+FAN_OUT_CONTROLLERS = [1, 10, 100]
+
+
+@dataclass
+class Scenario:
+    name: str
+    config: dict[str, Any]
+    # Actions published by the controller in each round. Each action is
+    # handled before publishing the next one, so holds use `max_loops`.
+    actions: list[str]
+    extra: dict[str, Any] = field(default_factory=dict)
+    # Seconds to wait after each round, so delayed actions can run
+    pause: float = 0
+
+
+@dataclass
+class BenchmarkResult:
+    scenario: str
+    events: int
+    service_calls: int
+    events_per_second: float
+    p50_latency_ms: float
+    p99_latency_ms: float
+    retained_kib_per_event: float
+    peak_kib: float
+
+
+@dataclass
+class FanOutResult:
+    controllers: int
+    events: int
+    callbacks_per_event: float
+    us_per_event: float
+
+
+def _config(class_: str, **kwargs: Any) -> dict[str, Any]:
+    return {
+        "module": "controllerx",
+        "class": class_,
+        "controller": CONTROLLER_ID,
+        "integration": {"name": "z2m", "listen_to": "mqtt"},
+        "light": LIGHT,
+        # Events are replayed faster than a person can press a button
+        "action_delta": 0,
+        **kwargs,
+    }
+
+
+SCENARIOS = [
+    Scenario(
+        "click",
+        _config("E1810Controller"),
+        ["toggle", "brightness_up_click", "arrow_right_click"],
+    ),
+    Scenario(
+        "hold",
+        _config("E1810Controller", delay=0, max_loops=5),
+        ["brightness_up_hold", "brightness_up_release"],
+    ),
+    Scenario(
+        "rotation",
+        _config("ZNXNKG02LMLightController", delay=0, max_loops=5),
+        ["start_rotating", "stop_rotating"],
+        extra={"action_rotation_angle": 42},
+    ),
+    Scenario(
+        "multiple_click",
+        _config(
+            "E1810Controller",
+            multiple_click_delay=1,
+            merge_mapping={"toggle$2": "on_full_brightness"},
+        ),
+        ["toggle", "toggle"],
+        pause=0.01,
+    ),
+    Scenario(
+        "z2m_light",
+        _config("E1810Z2MLightController", light={"name": "livingroom"}),
+        [
+            "toggle",
+            "brightness_up_click",
+            "brightness_up_hold",
+            "brightness_up_release",
+        ],
+    ),
+]
+
+
+def _percentile(values: list[float], percentile: int) -> float:
+    if not values:
+        return 0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percentile - 1]
+
+
+def _latencies(event_times: list[float], backend: FakeBackend) -> list[float]:
+    """
+    Each service call is attributed to the last event published before it,
+    and the latency of an event is the time until its first service call.
+    """
+    latencies: list[float] = []
+    event_idx = -1
+    last_event_with_call = -1
+    for service_call in backend.service_calls:
+        while (
+            event_idx + 1 < len(event_times)
+            and event_times[event_idx + 1] <= service_call.timestamp
+        ):
+            event_idx += 1
+        if event_idx >= 0 and event_idx != last_event_with_call:
+            latencies.append(service_call.timestamp - event_times[event_idx])
+            last_event_with_call = event_idx
+    return latencies
+
+
+async def _run_rounds(
+    scenario: Scenario, backend: FakeBackend, rounds: int
+) -> tuple[list[float], float]:
+    topic = f"zigbee2mqtt/{CONTROLLER_ID}"
+    payloads = [
+        json.dumps({"action": action, **scenario.extra}) for action in scenario.actions
+    ]
+    event_times: list[float] = []
+    paused = 0.0
+    for _ in range(rounds):
+        for payload in payloads:
+            event_times.append(time.perf_counter())
+            await backend.publish(topic, payload)
+        if scenario.pause > 0:
+            await asyncio.sleep(scenario.pause)
+            paused += scenario.pause
+    return event_times, paused
+
+
+async def _create_controller(scenario: Scenario, backend: FakeBackend) -> Controller:
+    backend.set_state(
+        LIGHT,
+        "on",
+        brightness=128,
+        color_temp=300,
+        min_mireds=153,
+        max_mireds=500,
+        supported_features=0b101111,
+        supported_color_modes=["color_temp", "xy"],
+    )
+    controller = get_controller(scenario.config["module"], scenario.config["class"])
+    if controller is None:
+        raise ValueError(
+            f"`{scenario.config['class']}` class controller does not exist"
+        )
+    controller.args = deepcopy(scenario.config)
+    await controller.initialize()
+    return controller
+
+
+async def run_scenario(scenario: Scenario, rounds: int) -> BenchmarkResult:
+    backend = FakeBackend()
+    with backend.install():
+        await _create_controller(scenario, backend)
+
+        # Warm up caches before measuring
+        await _run_rounds(scenario, backend, 1)
+        backend.service_calls.clear()
+
+        start = time.perf_counter()
+        event_times, paused = await _run_rounds(scenario, backend, rounds)
+        elapsed = time.perf_counter() - start - paused
+        latencies = [latency * 1000 for latency in _latencies(event_times, backend)]
+        service_calls = len(backend.service_calls)
+
+        backend.record_calls = False
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            await _run_rounds(scenario, backend, rounds)
+            gc.collect()
+            after, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    events = len(event_times)
+    return BenchmarkResult(
+        scenario=scenario.name,
+        events=events,
+        service_calls=service_calls,
+        events_per_second=events / elapsed if elapsed > 0 else 0,
+        p50_latency_ms=_percentile(latencies, 50),
+        p99_latency_ms=_percentile(latencies, 99),
+        retained_kib_per_event=(after - before) / 1024 / events,
+        peak_kib=(peak - before) / 1024,
+    )
+
+
+async def run_fan_out(controllers: int, rounds: int) -> FanOutResult:
+    """
+    It measures the cost of a `homematic.keypress` event for one controller
+    while many Homematic controllers are running.
+    """
+    backend = FakeBackend()
+    with backend.install():
+        for idx in range(controllers):
+            light = f"light.room_{idx}"
+            backend.set_state(light, "on", brightness=128, supported_features=0)
+            controller = get_controller("controllerx", "HMPB2WM552LightController")
+            assert controller is not None
+            controller.args = {
+                "controller": f"remote_{idx}",
+                "integration": "homematic",
+                "light": light,
+                "action_delta": 0,
+            }
+            await controller.initialize()
+
+        events = [
+            {"name": "remote_0", "param": param, "channel": channel}
+            for param, channel in (("PRESS_SHORT", 1), ("PRESS_SHORT", 2))
+        ]
+        backend.deliveries = 0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for event in events:
+                await backend.fire_event("homematic.keypress", event)
+        elapsed = time.perf_counter() - start
+
+    total_events = rounds * len(events)
+    return FanOutResult(
+        controllers=controllers,
+        events=total_events,
+        callbacks_per_event=backend.deliveries / total_events,
+        us_per_event=elapsed / total_events * 1_000_000,
+    )
+
+
+def format_results(results: list[BenchmarkResult]) -> str:
+    header = (
+        f"{'scenario':<16}{'events':>8}{'calls':>8}{'events/s':>12}"
+        f"{'p50 ms':>10}{'p99 ms':>10}{'retained KiB/event':>20}{'peak KiB':>10}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        lines.append(
+            f"{result.scenario:<16}{result.events:>8}{result.service_calls:>8}"
+            f"{result.events_per_second:>12.0f}{result.p50_latency_ms:>10.3f}"
+            f"{result.p99_latency_ms:>10.3f}{result.retained_kib_per_event:>20.3f}"
+            f"{result.peak_kib:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def format_fan_out_results(results: list[FanOutResult]) -> str:
+    header = f"{'controllers':<16}{'events':>8}{'callbacks':>11}{'us/event':>10}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        lines.append(
+            f"{result.controllers:<16}{result.events:>8}"
+            f"{result.callbacks_per_event:>11.1f}{result.us_per_event:>10.1f}"
+        )
+    return "\n".join(lines)
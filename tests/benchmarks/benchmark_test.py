@@ -0,0 +1,32 @@
+import pytest
+
+from tests.benchmarks.benchmark import (
+    SCENARIOS,
+    Scenario,
+    format_fan_out_results,
+    format_results,
+    run_fan_out,
+    run_scenario,
+)
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda scenario: scenario.name)
+async def test_run_scenario(scenario: Scenario) -> None:
+    rounds = 3
+    result = await run_scenario(scenario, rounds)
+
+    assert result.events == rounds * len(scenario.actions)
+    assert result.service_calls > 0
+    assert result.events_per_second > 0
+    assert 0 < result.p50_latency_ms <= result.p99_latency_ms
+    assert scenario.name in format_results([result])
+
+
+async def test_run_fan_out() -> None:
+    rounds = 3
+    results = [await run_fan_out(controllers, rounds) for controllers in (1, 5)]
+
+    # A single listener is called for each event, whatever the controllers
+    assert [result.callbacks_per_event for result in results] == [1, 1]
+    assert all(result.events == rounds * 2 for result in results)
+    assert "controllers" in format_fan_out_results(results)
@@ -0,0 +1,159 @@
+import asyncio
+import time
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+from unittest import mock
+
+import appdaemon.plugins.hass.hassapi as hass
+import appdaemon.plugins.mqtt.mqttapi as mqtt
+from appdaemon.adapi import ADAPI
+from cx_core import Controller, event_hub
+
+Callback = Callable[..., Any]
+
+
+@dataclass
+class ServiceCall:
+    service: str
+    data: dict[str, Any]
+    timestamp: float
+
+
+@dataclass
+class Subscription:
+    callback: Callback
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+class FakeBackend:
+    """
+    In-process replacement for Home Assistant and the MQTT broker. It keeps
+    the entity states, records the service calls and delivers the events to
+    the callbacks the controllers subscribed to, so the controllers run the
+    same code as with AppDaemon.
+    """
+
+    states: dict[str, dict[str, Any]]
+    service_calls: list[ServiceCall]
+    mqtt_subscriptions: dict[str, list[Subscription]]
+    event_subscriptions: dict[str, list[Subscription]]
+    state_subscriptions: dict[str, list[Subscription]]
+    # Callbacks called to deliver the events
+    deliveries: int
+    # Service calls are not kept when measuring memory
+    record_calls: bool = True
+
+    def __init__(self) -> None:
+        self.states = {}
+        self.service_calls = []
+        self.mqtt_subscriptions = {}
+        self.event_subscriptions = {}
+        self.state_subscriptions = {}
+        self.deliveries = 0
+
+    def set_state(self, entity_id: str, state: Any, **attributes: Any) -> None:
+        self.states[entity_id] = {
+            "entity_id": entity_id,
+            "state": state,
+            "attributes": attributes,
+        }
+
+    @contextmanager
+    def install(self) -> Iterator["FakeBackend"]:
+        """
+        It patches the AppDaemon API used by ControllerX to use this backend.
+        """
+
+        async def listen_event(
+            controller: Controller, callback: Callback, event: str = "", **kwargs: Any
+        ) -> None:
+            if "topic" in kwargs:
+                subscriptions = self.mqtt_subscriptions.setdefault(kwargs["topic"], [])
+            else:
+                subscriptions = self.event_subscriptions.setdefault(event, [])
+            subscriptions.append(Subscription(callback, kwargs))
+
+        async def listen_state(
+            controller: Controller, callback: Callback, entity_id: str, **kwargs: Any
+        ) -> None:
+            self.state_subscriptions.setdefault(entity_id, []).append(
+                Subscription(callback, kwargs)
+            )
+
+        async def call_service(
+            controller: Controller, service: str, **data: Any
+        ) -> None:
+            if self.record_calls:
+                self.service_calls.append(
+                    ServiceCall(service, data, time.perf_counter())
+                )
+
+        async def get_state(
+            controller: Controller,
+            entity_id: str | None = None,
+            attribute: str | None = None,
+            **kwargs: Any,
+        ) -> Any:
+            state = self.states.get(entity_id or "")
+            if state is None:
+                return None
+            if attribute is None:
+                return state["state"]
+            if attribute == "all":
+                return state
+            return state["attributes"].get(attribute, state.get(attribute))
+
+        async def namespace_exists(controller: Controller, namespace: str) -> bool:
+            # The MQTT plugin is available
+            return namespace == "mqtt"
+
+        async def run_in(
+            controller: Controller, fn: Callback, delay: float, **kwargs: Any
+        ) -> "asyncio.Task[None]":
+            async def inner() -> None:
+                await asyncio.sleep(delay)
+                await fn(kwargs)
+
+            return asyncio.create_task(inner())
+
+        async def cancel_timer(
+            controller: Controller, task: "asyncio.Task[None]"
+        ) -> bool:
+            return task.cancel()
+
+        with ExitStack() as stack:
+            for target, name, new in (
+                (hass.Hass, "__init__", lambda *args, **kwargs: None),
+                (hass.Hass, "namespace", "default"),
+                (hass.Hass, "log", lambda *args, **kwargs: None),
+                (hass.Hass, "get_ad_version", lambda *args, **kwargs: "4.0.0"),
+                (hass.Hass, "listen_event", listen_event),
+                (mqtt.Mqtt, "listen_event", listen_event),
+                (hass.Hass, "listen_state", listen_state),
+                (hass.Hass, "run_in", run_in),
+                (hass.Hass, "cancel_timer", cancel_timer),
+                (ADAPI, "call_service", call_service),
+                (ADAPI, "namespace_exists", namespace_exists),
+                (Controller, "get_state", get_state),
+            ):
+                stack.enter_context(mock.patch.object(target, name, new))
+            # Shared listeners only live as long as the backend
+            stack.enter_context(mock.patch.object(event_hub, "_event_hubs", {}))
+            yield self
+
+    async def publish(self, topic: str, payload: str) -> None:
+        for subscription in self.mqtt_subscriptions.get(topic, []):
+            self.deliveries += 1
+            await subscription.callback(
+                "MQTT_MESSAGE", {"topic": topic, "payload": payload}, {}
+            )
+
+    async def fire_event(self, event: str, data: dict[str, Any]) -> None:
+        for subscription in self.event_subscriptions.get(event, []):
+            if all(
+                data.get(key) == value for key, value in subscription.kwargs.items()
+            ):
+                self.deliveries += 1
+                await subscription.callback(event, data, {})
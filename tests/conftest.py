@@ -7,7 +7,7 @@ import appdaemon.plugins.hass.hassapi as hass
 import appdaemon.plugins.mqtt.mqttapi as mqtt
 import pytest
 from appdaemon.adapi import ADAPI
-from cx_core import Controller
+from cx_core import Controller, event_hub, service_queue
 from pytest import MonkeyPatch
 
 from tests.test_utils import fake_fn
@@ -35,11 +35,16 @@ def hass_mock(monkeypatch: MonkeyPatch) -> None:
     """
 
     monkeypatch.setattr(hass.Hass, "__init__", fake_fn())
+    monkeypatch.setattr(hass.Hass, "namespace", "default")
     monkeypatch.setattr(hass.Hass, "listen_event", fake_fn(async_=True))
     monkeypatch.setattr(mqtt.Mqtt, "listen_event", fake_fn(async_=True))
     monkeypatch.setattr(hass.Hass, "listen_state", fake_fn(async_=True))
     monkeypatch.setattr(hass.Hass, "log", fake_fn())
     monkeypatch.setattr(ADAPI, "call_service", fake_fn(async_=True))
+    monkeypatch.setattr(ADAPI, "namespace_exists", fake_fn(False, async_=True))
     monkeypatch.setattr(hass.Hass, "get_ad_version", fake_fn(to_return="4.0.0"))
     monkeypatch.setattr(hass.Hass, "run_in", fake_run_in)
     monkeypatch.setattr(hass.Hass, "cancel_timer", fake_cancel_timer)
+    # Shared listeners do not leak from one test to another
+    monkeypatch.setattr(event_hub, "_event_hubs", {})
+    monkeypatch.setattr(service_queue, "_service_queues", {})
@@ -126,6 +126,12 @@ async def test_integ_configs(
         elif isinstance(action, float):
             await asyncio.sleep(action)
 
+    # Multiple click timers are not tasks, so we wait for them to fire
+    while any(
+        state.timer is not None for state in controller.multiple_click_states.values()
+    ):
+        await asyncio.sleep(0.01)
+
     pending: set[asyncio.Task[Any]] = asyncio.all_tasks()
     # We exclude the current function we are executing
     pending = {
@@ -1,9 +1,16 @@
+import inspect
 from typing import Any
 
 import pytest
 from cx_const import ActionFunctionWithParams, ActionParams, TypeAction
-from cx_core.action_type.predefined_action_type import _get_action, _get_arguments
+from cx_core.action_type.predefined_action_type import (
+    PredefinedActionType,
+    _bind_action,
+    _get_action,
+)
+from cx_core.controller import Controller
 from cx_core.integration import EventData
+from pytest_mock.plugin import MockerFixture
 
 from tests.test_utils import fake_fn, wrap_execution
 
@@ -84,7 +91,7 @@ def test_get_action(
         ),
     ],
 )
-def test_get_arguments_general(
+def test_bind_action_general(
     action_args: ActionParams,
     user_args: dict[str, Any],
     expected: tuple[ActionParams, dict[str, Any]] | None,
@@ -93,7 +100,7 @@ def test_get_arguments_general(
         pass
 
     with wrap_execution(error_expected=expected is None, exception=ValueError):
-        output = _get_arguments(test_fn, action_args, user_args, None)
+        output = _bind_action(test_fn, action_args, user_args).get_arguments(None)
 
     if expected is not None:
         assert expected == output
@@ -122,7 +129,7 @@ def test_get_arguments_general(
         ),  # args cannot override extra
     ],
 )
-def test_get_arguments_with_extra(
+def test_bind_action_with_extra(
     action_args: ActionParams,
     user_args: dict[str, Any],
     extra: EventData | None,
@@ -132,7 +139,47 @@ def test_get_arguments_with_extra(
         pass
 
     with wrap_execution(error_expected=expected is None, exception=ValueError):
-        output = _get_arguments(test_fn, action_args, user_args, extra)
+        bound_action = _bind_action(test_fn, action_args, user_args)
+        output = bound_action.get_arguments(extra)
 
     if expected is not None:
         assert expected == output
+
+
+@pytest.mark.parametrize(
+    "action_key, templated",
+    [
+        ("test", False),
+        ("{{ 'test' }}", True),
+    ],
+)
+async def test_run_binds_arguments_once(
+    fake_controller: Controller,
+    mocker: MockerFixture,
+    action_key: str,
+    templated: bool,
+) -> None:
+    stub = mocker.stub()
+
+    async def test_fn(a: str, b: int = 2, extra: EventData | None = None) -> None:
+        stub(a, b, extra)
+
+    mocker.patch.object(
+        fake_controller,
+        "get_predefined_actions_mapping",
+        return_value={"test": (test_fn, ("value",))},
+    )
+    mocker.patch.object(fake_controller, "render_value", return_value="test")
+    signature_spy = mocker.spy(inspect, "signature")
+    sut = PredefinedActionType(fake_controller, {"action": action_key, "b": 42})
+
+    await sut.run(extra={"event": 1})
+    await sut.run(extra={"event": 2})
+
+    assert signature_spy.call_count == 1
+    stub.assert_has_calls(
+        [
+            mocker.call("value", 42, {"event": 1}),
+            mocker.call("value", 42, {"event": 2}),
+        ]
+    )
@@ -1,5 +1,15 @@
+from typing import Any
+
 import pytest
-from cx_core.color_helper import Colors, get_color_wheel
+from cx_core.color_helper import (
+    Colors,
+    ColorWheel,
+    Gamut,
+    default_color_wheel,
+    get_color_gamut,
+    get_color_wheel,
+    get_color_wheel_lut,
+)
 
 from tests.test_utils import wrap_execution
 
@@ -16,3 +26,61 @@ from tests.test_utils import wrap_execution
 def test_get_color_wheel(colors: Colors, error_expected: bool) -> None:
     with wrap_execution(error_expected=error_expected, exception=ValueError):
         colors = get_color_wheel(colors)
+
+
+@pytest.mark.parametrize("resolution", [1, 4])
+def test_color_wheel_passes_through_colors(resolution: int) -> None:
+    color_wheel = ColorWheel(default_color_wheel, resolution)
+
+    assert len(color_wheel) == len(default_color_wheel) * resolution
+    for index, color in enumerate(default_color_wheel):
+        assert color_wheel[index * resolution] == color
+
+
+def test_color_wheel_interpolated_colors() -> None:
+    color_wheel = ColorWheel([(0.2, 0.2), (0.4, 0.2), (0.4, 0.4), (0.2, 0.4)], 2)
+
+    assert color_wheel[1] == (0.3, 0.175)
+    # It loops back to the first color
+    assert color_wheel[8] == (0.2, 0.2)
+
+
+def test_color_wheel_gamut() -> None:
+    gamut: Gamut = ((0.6, 0.3), (0.3, 0.6), (0.15, 0.06))
+    color_wheel = ColorWheel([(0.7, 0.3), (0.323, 0.329)], gamut=gamut)
+
+    assert color_wheel[0] == (0.6, 0.3)
+    assert color_wheel[1] == (0.323, 0.329)
+
+
+def test_color_wheel_invalid_resolution() -> None:
+    with wrap_execution(error_expected=True, exception=ValueError):
+        ColorWheel(default_color_wheel, 0)
+
+
+def test_get_color_wheel_lut() -> None:
+    colors = [[0.2, 0.3], [0.4, 0.5]]
+
+    assert get_color_wheel_lut(colors, 2) is get_color_wheel_lut(colors, 2)  # type: ignore[arg-type]
+    assert get_color_wheel_lut(colors, 2) is not get_color_wheel_lut(colors, 4)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "gamut, expected, error_expected",
+    [
+        (None, None, False),
+        (
+            [[0.6, 0.3], [0.3, 0.6], [0.15, 0.06]],
+            ((0.6, 0.3), (0.3, 0.6), (0.15, 0.06)),
+            False,
+        ),
+        ([[0.6, 0.3], [0.3, 0.6]], None, True),
+        ([[0.6, 0.3], [0.3, 0.6], [0.15]], None, True),
+        ("gamut_c", None, True),
+    ],
+)
+def test_get_color_gamut(
+    gamut: Any, expected: Gamut | None, error_expected: bool
+) -> None:
+    with wrap_execution(error_expected=error_expected, exception=ValueError):
+        assert get_color_gamut(gamut) == expected
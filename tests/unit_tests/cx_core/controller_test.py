@@ -1,13 +1,19 @@
-from collections import defaultdict
+import asyncio
+import contextvars
+import logging
 from typing import Any
 
 import pytest
 from appdaemon.adapi import ADAPI
+from appdaemon.plugins.hass.hassapi import Hass
 from cx_const import ActionEvent
 from cx_core import integration as integration_module
 from cx_core.action_type import ActionsMapping
 from cx_core.action_type.base import ActionType
-from cx_core.controller import Controller, action
+from cx_core.action_type.call_service_action_type import CallServiceActionType
+from cx_core.controller import ActionRecord, Controller, action
+from cx_core.metrics import STAGE_QUEUE, STAGE_SERVICE, STAGE_TOTAL, ActionMetrics
+from cx_core.service_queue import ServiceCallQueue
 from pytest import MonkeyPatch
 from pytest_mock.plugin import MockerFixture
 
@@ -219,6 +225,33 @@ async def test_merge_mapping(
         assert list(sut_before_init.actions_mapping.keys()) == actions_output
 
 
+@pytest.mark.parametrize(
+    "metrics, error_expected",
+    [
+        ({"sensor": "sensor.metrics", "interval": 30}, False),
+        ({"sensor": "sensor.metrics", "fake_key": 30}, True),
+    ],
+)
+async def test_initialize_metrics(
+    sut_before_init: Controller,
+    mocker: MockerFixture,
+    metrics: dict[str, Any],
+    error_expected: bool,
+) -> None:
+    sut_before_init.args["metrics"] = metrics
+    mocker.patch.object(
+        Controller, "name", new_callable=mocker.PropertyMock, return_value="test"
+    )
+    mocker.patch.object(sut_before_init, "get_default_actions_mapping", return_value={})
+
+    with wrap_execution(error_expected=error_expected, exception=ValueError):
+        await sut_before_init.initialize()
+
+    if not error_expected:
+        assert sut_before_init.metrics is not None
+        assert sut_before_init.metrics.interval == 30
+
+
 @pytest.mark.parametrize(
     "test_input,expected",
     [
@@ -319,6 +352,141 @@ def test_get_multiple_click_actions(
     assert output == set(expected)
 
 
+@pytest.mark.parametrize(
+    "mapping, expected",
+    [
+        (["toggle", "another"], {}),
+        (["toggle$1", "toggle$3", "toggle$2"], {"toggle": 3}),
+        ([1001, "1001$2", "another$4"], {1001: 2, "another": 4}),
+    ],
+)
+def test_get_multiple_click_max_counts(
+    fake_action_type: ActionType,
+    sut: Controller,
+    mapping: list[ActionEvent],
+    expected: dict[ActionEvent, int],
+) -> None:
+    actions_mapping: ActionsMapping = {key: [fake_action_type] for key in mapping}
+    assert sut.get_multiple_click_max_counts(actions_mapping) == expected
+
+
+@pytest.mark.parametrize(
+    "early_fire, clicks, expected_calls",
+    [
+        (False, 3, [3]),
+        (False, 2, [2]),
+        (True, 2, [2]),
+        (True, 3, [3]),
+        (True, 4, [3, 1]),
+    ],
+)
+async def test_handle_action_multiple_click(
+    sut: Controller,
+    mocker: MockerFixture,
+    early_fire: bool,
+    clicks: int,
+    expected_calls: list[int],
+) -> None:
+    click_counts: list[int] = []
+
+    async def fake_multiple_click_call_action(kwargs: dict[str, Any]) -> None:
+        click_counts.append(kwargs["click_count"])
+
+    mocker.patch.object(
+        sut, "multiple_click_call_action", fake_multiple_click_call_action
+    )
+    timer_callback_spy = mocker.spy(sut, "multiple_click_timer_callback")
+    sut.multiple_click_delay = 50
+    sut.multiple_click_early_fire = early_fire
+    sut.action_records = {"toggle": ActionRecord(multiple_click=True, max_clicks=3)}
+
+    for _ in range(clicks):
+        await sut.handle_action("toggle")
+        await asyncio.sleep(0.01)
+    if early_fire and clicks == 3:
+        # The last click is the highest mapped, so it does not wait
+        assert click_counts == [3]
+    await asyncio.sleep(0.1)
+
+    assert click_counts == expected_calls
+    # The timer is only re-scheduled when it expires, not on each click
+    assert timer_callback_spy.call_count <= 2 * len(expected_calls)
+
+
+async def test_multiple_click_after_timer(
+    sut: Controller, mocker: MockerFixture
+) -> None:
+    click_counts: list[int] = []
+
+    async def fake_multiple_click_call_action(kwargs: dict[str, Any]) -> None:
+        click_counts.append(kwargs["click_count"])
+
+    mocker.patch.object(
+        sut, "multiple_click_call_action", fake_multiple_click_call_action
+    )
+    sut.multiple_click_delay = 20
+    sut.action_records = {"toggle": ActionRecord(multiple_click=True)}
+
+    await sut.handle_action("toggle")
+    state = sut.multiple_click_states["toggle"]
+    assert state.timer is not None
+    state.timer.cancel()
+    state.deadline = 0
+    # The click arrives after the timer fired, but before its task runs
+    sut.multiple_click_timer_callback("toggle")
+    await sut.handle_action("toggle")
+    await asyncio.sleep(0.05)
+
+    assert click_counts == [1, 1]
+
+
+@pytest.mark.parametrize(
+    "mapping, custom_delta, expected_records",
+    [
+        (["toggle"], None, {"toggle": (300, False)}),
+        (
+            ["toggle", "toggle$2"],
+            None,
+            {"toggle": (300, True), "toggle$2": (300, False)},
+        ),
+        (
+            ["toggle$2"],
+            {"toggle$2": 0},
+            {"toggle": (300, True), "toggle$2": (0, False)},
+        ),
+        ([1001, "1001$2"], 10, {1001: (10, True), "1001$2": (10, False)}),
+    ],
+)
+def test_compile_action_records(
+    fake_action_type: ActionType,
+    sut: Controller,
+    mapping: list[ActionEvent],
+    custom_delta: int | dict[ActionEvent, int] | None,
+    expected_records: dict[ActionEvent, tuple[int, bool]],
+) -> None:
+    actions_mapping: ActionsMapping = {key: [fake_action_type] for key in mapping}
+    records = sut.compile_action_records(
+        actions_mapping,
+        action_delay=sut.get_mapping_per_action(
+            actions_mapping, custom=None, default=0
+        ),
+        action_delta=sut.get_mapping_per_action(
+            actions_mapping, custom=custom_delta, default=300
+        ),
+        previous_states=sut.get_mapping_per_action(
+            actions_mapping, custom=None, default=None
+        ),
+        mode=sut.get_mapping_per_action(actions_mapping, custom=None, default="single"),
+        multiple_click_actions=sut.get_multiple_click_actions(actions_mapping),
+    )
+
+    assert {
+        key: (record.delta, record.multiple_click) for key, record in records.items()
+    } == expected_records
+    for key, record in records.items():
+        assert record.action_types == actions_mapping.get(key, [])
+
+
 @pytest.mark.parametrize(
     "option, options, error_expected",
     [
@@ -362,8 +530,10 @@ def test_get_integration(
         integration = fake_controller.get_integration(integration_input)
 
     if not error_expected:
-        get_integrations_spy.assert_called_once_with(fake_controller, args_expected)
+        get_integrations_spy.assert_not_called()
         assert integration.name == integration_name_expected
+        assert integration.controller == fake_controller
+        assert integration.kwargs == args_expected
 
 
 def test_get_default_actions_mapping_happyflow(
@@ -415,11 +585,11 @@ async def test_handle_action(
     expected_calls: int,
     fake_action_type: ActionType,
 ) -> None:
-    sut.action_delta = {action_called: action_delta}
-    sut.action_times = defaultdict(int)
-
     sut.actions_mapping = {action: [fake_action_type] for action in actions_input}
-    sut.previous_states = defaultdict(lambda: None)
+    sut.action_records = {
+        action: ActionRecord([fake_action_type], delta=action_delta)
+        for action in actions_input
+    }
     call_action_patch = mocker.patch.object(sut, "call_action")
 
     # SUT
@@ -430,6 +600,36 @@ async def test_handle_action(
     assert call_action_patch.call_count == expected_calls
 
 
+@pytest.mark.parametrize(
+    "record_previous_state, previous_state, expected_calls",
+    [
+        (None, None, 1),
+        (None, "on", 1),
+        ("on", "on", 1),
+        ("on", "off", 0),
+        ("on", None, 0),
+    ],
+)
+async def test_handle_action_previous_state(
+    sut: Controller,
+    mocker: MockerFixture,
+    record_previous_state: str | None,
+    previous_state: str | None,
+    expected_calls: int,
+    fake_action_type: ActionType,
+) -> None:
+    sut.action_records = {
+        "action": ActionRecord([fake_action_type], previous_state=record_previous_state)
+    }
+    call_action_patch = mocker.patch.object(sut, "call_action")
+
+    # SUT
+    await sut.handle_action("action", previous_state=previous_state)
+
+    # Checks
+    assert call_action_patch.call_count == expected_calls
+
+
 @pytest.mark.parametrize(
     "delay,handle,cancel_timer_called,run_in_called,action_timer_callback_called",
     [
@@ -449,7 +649,7 @@ async def test_call_action(
     action_timer_callback_called: bool,
 ) -> None:
     action_key = "test"
-    sut.action_delay = {action_key: delay}
+    sut.action_records = {action_key: ActionRecord(delay=delay)}
     action_delay_handles: dict[ActionEvent, str | None] = {action_key: handle}
     sut.action_delay_handles = action_delay_handles
 
@@ -488,6 +688,157 @@ async def test_call_service(
     call_service_stub.assert_called_once_with(sut, service, **attributes)
 
 
+@pytest.mark.parametrize(
+    "logger_level, level, expected_output",
+    [
+        (None, "DEBUG", True),
+        (logging.INFO, "DEBUG", False),
+        (logging.INFO, "INFO", True),
+        (logging.WARNING, logging.ERROR, True),
+    ],
+)
+def test_is_logging(
+    sut: Controller,
+    logger_level: int | None,
+    level: str | int,
+    expected_output: bool,
+) -> None:
+    if logger_level is not None:
+        sut.logger = logging.getLogger("controllerx_test")
+        sut.logger.setLevel(logger_level)
+    assert sut.is_logging(level) == expected_output
+
+
+async def test_call_service_without_info_logs(
+    sut: Controller, mocker: MockerFixture
+) -> None:
+    log_stub = mocker.patch.object(Hass, "log")
+    call_service_stub = mocker.patch.object(ADAPI, "call_service")
+    sut.logger = logging.getLogger("controllerx_test")
+    sut.logger.setLevel(logging.WARNING)
+
+    await sut.call_service("light.turn_on", entity_id="light.test", brightness=10.5)
+    sut.log("Test %s", "error", level="ERROR")
+
+    log_stub.assert_called_once_with("Test %s", "error", level="ERROR")
+    call_service_stub.assert_called_once_with(
+        sut, "light/turn_on", entity_id="light.test", brightness=10.5
+    )
+
+
+async def test_call_service_with_queue(sut: Controller, mocker: MockerFixture) -> None:
+    call_service_stub = mocker.patch.object(ADAPI, "call_service")
+    sut.service_queue = ServiceCallQueue()
+    await sut.call_service("light.turn_on", entity_id="light.test", brightness=10)
+    call_service_stub.assert_called_once_with(
+        sut, "light/turn_on", entity_id="light.test", brightness=10
+    )
+
+
+async def test_handle_action_with_metrics(
+    sut: Controller, mocker: MockerFixture
+) -> None:
+    mocker.patch.object(ADAPI, "call_service")
+    set_state_patch = mocker.patch.object(Hass, "set_state", new=mocker.AsyncMock())
+    sut.metrics = ActionMetrics(sut, "test", sensor="sensor.metrics")
+    action_type = CallServiceActionType(
+        sut, {"service": "light.toggle", "entity_id": "light.test"}
+    )
+    sut.action_records = {"toggle": ActionRecord(action_types=[action_type], delta=0)}
+
+    await sut.handle_action("toggle")
+
+    assert set(sut.metrics.histograms) == {
+        ("toggle", STAGE_QUEUE),
+        ("toggle", STAGE_SERVICE),
+        ("toggle", STAGE_TOTAL),
+    }
+    set_state_patch.assert_called_once()
+
+
+async def test_handle_action_with_metrics_and_delay(
+    sut: Controller, mocker: MockerFixture
+) -> None:
+    mocker.patch.object(ADAPI, "call_service")
+    mocker.patch.object(Hass, "set_state", new=mocker.AsyncMock())
+    run_in_patch = mocker.patch.object(sut, "run_in")
+    sut.metrics = ActionMetrics(sut, "test", sensor="sensor.metrics")
+    action_type = CallServiceActionType(
+        sut, {"service": "light.toggle", "entity_id": "light.test"}
+    )
+    sut.action_records = {
+        "toggle": ActionRecord(action_types=[action_type], delta=0, delay=1)
+    }
+    sut.action_delay_handles = {"toggle": None}
+
+    await sut.handle_action("toggle")
+    # The scheduler runs the callback outside of the context of the event
+    run_in_kwargs = run_in_patch.call_args.kwargs
+    await contextvars.Context().run(
+        asyncio.ensure_future, sut.action_timer_callback(run_in_kwargs)
+    )
+
+    assert run_in_kwargs["event_time"] is not None
+    assert set(sut.metrics.histograms) == {
+        ("toggle", STAGE_QUEUE),
+        ("toggle", STAGE_SERVICE),
+        ("toggle", STAGE_TOTAL),
+    }
+
+
+async def test_handle_action_with_event_window(
+    sut: Controller, mocker: MockerFixture
+) -> None:
+    call_action_patch = mocker.patch.object(sut, "call_action")
+    sut.args = {}
+    sut.action_records = {
+        "rotate": ActionRecord(
+            event_window=sut.get_event_window("rotate", 20, "accumulate")
+        )
+    }
+
+    for angle in (10, 20, 30):
+        await sut.handle_action("rotate", extra={"action_rotation_angle": angle})
+    call_action_patch.assert_not_called()
+    await asyncio.sleep(0.05)
+
+    call_action_patch.assert_called_once_with(
+        "rotate", extra={"action_rotation_angle": 60}
+    )
+
+
+def test_compile_action_records_event_window_multiple_click(
+    fake_action_type: ActionType, sut: Controller
+) -> None:
+    sut.args = {}
+    actions_mapping: ActionsMapping = {
+        key: [fake_action_type] for key in ("toggle", "toggle$2", "rotate")
+    }
+    records = sut.compile_action_records(
+        actions_mapping,
+        action_delay=sut.get_mapping_per_action(
+            actions_mapping, custom=None, default=0
+        ),
+        action_delta=sut.get_mapping_per_action(
+            actions_mapping, custom=None, default=300
+        ),
+        previous_states=sut.get_mapping_per_action(
+            actions_mapping, custom=None, default=None
+        ),
+        mode=sut.get_mapping_per_action(actions_mapping, custom=None, default="single"),
+        multiple_click_actions=sut.get_multiple_click_actions(actions_mapping),
+        event_window=sut.get_mapping_per_action(actions_mapping, custom=50, default=0),
+    )
+
+    assert records["toggle"].multiple_click
+    assert records["toggle"].event_window is None
+    assert records["rotate"].event_window is not None
+
+
+def test_get_event_window_disabled(sut: Controller) -> None:
+    assert sut.get_event_window("rotate", 0, "throttle") is None
+
+
 @pytest.mark.parametrize(
     "template, expected",
     [
@@ -503,3 +854,84 @@ async def test_call_service(
 def test_render_value(sut: Controller, template: str, expected: bool) -> None:
     output = sut.contains_templating(template)
     assert output == expected
+
+
+@pytest.mark.parametrize(
+    "template_cache_ttl, expected_renders",
+    [
+        (0, 3),
+        (60, 1),
+    ],
+)
+async def test_render_value_cache(
+    sut: Controller,
+    mocker: MockerFixture,
+    template_cache_ttl: float,
+    expected_renders: int,
+) -> None:
+    sut.template_cache_ttl = template_cache_ttl
+    render_template_patch = mocker.patch.object(
+        sut, "_render_template", return_value="light.kitchen"
+    )
+
+    for _ in range(3):
+        output = await sut.render_value("{{ states('input_text.light') }}")
+        assert output == "light.kitchen"
+    assert await sut.render_value("light.bedroom") == "light.bedroom"
+
+    assert render_template_patch.call_count == expected_renders
+
+
+async def test_render_value_cache_expires(
+    sut: Controller, mocker: MockerFixture
+) -> None:
+    template = "{{ to_render }}"
+    sut.template_cache_ttl = 10
+    render_template_patch = mocker.patch.object(
+        sut, "_render_template", side_effect=["light.kitchen", "light.bedroom"]
+    )
+
+    assert await sut.render_value(template) == "light.kitchen"
+    assert await sut.render_value(template) == "light.kitchen"
+    # Force the cached value to expire
+    _, value = sut._template_cache[template]
+    sut._template_cache[template] = (0, value)
+    assert await sut.render_value(template) == "light.bedroom"
+
+    assert render_template_patch.call_count == 2
+
+
+async def test_render_attributes(sut: Controller, mocker: MockerFixture) -> None:
+    rendering: set[str] = set()
+    max_concurrent_renders = 0
+
+    async def fake_render_template(template: str) -> Any:
+        nonlocal max_concurrent_renders
+        rendering.add(template)
+        max_concurrent_renders = max(max_concurrent_renders, len(rendering))
+        await asyncio.sleep(0)
+        rendering.remove(template)
+        return template.strip("{} ")
+
+    mocker.patch.object(sut, "_render_template", fake_render_template)
+    attributes = {
+        "entity_id": "{{ entity }}",
+        "brightness": 100,
+        "effect": "rainbow",
+        "data": {"color": "{{ color }}", "nested": {"speed": "{{ speed }}"}},
+    }
+
+    output = await sut.render_attributes(attributes)
+
+    assert output == {
+        "entity_id": "entity",
+        "brightness": 100,
+        "effect": "rainbow",
+        "data": {"color": "color", "nested": {"speed": "speed"}},
+    }
+    assert max_concurrent_renders == 3
+    # Input attributes are left untouched
+    assert attributes["data"] == {
+        "color": "{{ color }}",
+        "nested": {"speed": "{{ speed }}"},
+    }
@@ -0,0 +1,119 @@
+from typing import Any
+
+from cx_core import Controller
+from cx_core.event_hub import (
+    EventCallback,
+    EventHub,
+    get_event_hub,
+    unregister_controller,
+)
+from cx_core.integration import EventData
+from pytest_mock import MockerFixture
+
+
+class FakeListener:
+    def __init__(self) -> None:
+        self.controllers: list[Controller] = []
+
+    async def __call__(self, controller: Controller, callback: EventCallback) -> None:
+        self.controllers.append(controller)
+
+
+def get_key(data: EventData) -> Any:
+    return data.get("id")
+
+
+async def test_register_listens_once(mocker: MockerFixture) -> None:
+    listener = FakeListener()
+    event_hub = EventHub("test", listener, get_key)
+    controller_1, controller_2 = Controller(**{}), Controller(**{})
+
+    await event_hub.register(controller_1, "a", mocker.AsyncMock())
+    await event_hub.register(controller_2, "b", mocker.AsyncMock())
+
+    assert listener.controllers == [controller_1]
+    assert event_hub.owner is controller_1
+
+
+async def test_event_callback_routes_by_key(mocker: MockerFixture) -> None:
+    event_hub = EventHub("test", FakeListener(), get_key)
+    handler_a1 = mocker.AsyncMock()
+    handler_a2 = mocker.AsyncMock()
+    handler_b = mocker.AsyncMock()
+    await event_hub.register(Controller(**{}), "a", handler_a1)
+    await event_hub.register(Controller(**{}), "a", handler_a2)
+    await event_hub.register(Controller(**{}), "b", handler_b)
+
+    await event_hub.event_callback("event", {"id": "a"}, {})
+    await event_hub.event_callback("event", {"id": "c"}, {})
+
+    handler_a1.assert_called_once_with({"id": "a"})
+    handler_a2.assert_called_once_with({"id": "a"})
+    handler_b.assert_not_called()
+
+
+async def test_event_callback_prepares_once(mocker: MockerFixture) -> None:
+    prepare = mocker.stub()
+    prepare.return_value = {"prepared": True}
+    event_hub = EventHub("test", FakeListener(), get_key, prepare=prepare)
+    handler_1 = mocker.AsyncMock()
+    handler_2 = mocker.AsyncMock()
+    await event_hub.register(Controller(**{}), "a", handler_1)
+    await event_hub.register(Controller(**{}), "a", handler_2)
+
+    await event_hub.event_callback("event", {"id": "a"}, {})
+    await event_hub.event_callback("event", {"id": "b"}, {})
+
+    prepare.assert_called_once_with({"id": "a"})
+    handler_1.assert_called_once_with({"prepared": True})
+    handler_2.assert_called_once_with({"prepared": True})
+
+
+async def test_event_callback_skips_unprepared(mocker: MockerFixture) -> None:
+    event_hub = EventHub("test", FakeListener(), get_key, prepare=lambda data: None)
+    handler = mocker.AsyncMock()
+    await event_hub.register(Controller(**{}), "a", handler)
+
+    await event_hub.event_callback("event", {"id": "a"}, {})
+
+    handler.assert_not_called()
+
+
+async def test_unregister_moves_listener(mocker: MockerFixture) -> None:
+    listener = FakeListener()
+    event_hub = EventHub("test", listener, get_key)
+    controller_1, controller_2 = Controller(**{}), Controller(**{})
+    handler_1 = mocker.AsyncMock()
+    handler_2 = mocker.AsyncMock()
+    await event_hub.register(controller_1, "a", handler_1)
+    await event_hub.register(controller_2, "a", handler_2)
+
+    await event_hub.unregister(controller_1)
+    await event_hub.event_callback("event", {"id": "a"}, {})
+
+    assert listener.controllers == [controller_1, controller_2]
+    assert event_hub.owner is controller_2
+    handler_1.assert_not_called()
+    handler_2.assert_called_once_with({"id": "a"})
+
+    await event_hub.unregister(controller_2)
+    assert event_hub.routes == {}
+
+    # With no controllers left, the next one listens again
+    controller_3 = Controller(**{})
+    await event_hub.register(controller_3, "a", mocker.AsyncMock())
+    assert listener.controllers == [controller_1, controller_2, controller_3]
+
+
+async def test_get_event_hub_is_shared(mocker: MockerFixture) -> None:
+    listener = FakeListener()
+    event_hub = get_event_hub("test", listener, get_key)
+    controller = Controller(**{})
+    await event_hub.register(controller, "a", mocker.AsyncMock())
+
+    assert get_event_hub("test", listener, get_key) is event_hub
+    assert get_event_hub("other", listener, get_key) is not event_hub
+
+    await unregister_controller(controller)
+
+    assert event_hub.routes == {}
@@ -0,0 +1,109 @@
+import asyncio
+from typing import Any
+
+import pytest
+from cx_core.event_window import EventWindow
+from cx_core.integration import EventData
+
+from tests.test_utils import wrap_execution
+
+WINDOW = 50  # In milliseconds
+
+
+class FakeCall:
+    def __init__(self) -> None:
+        self.calls: list[EventData | None] = []
+
+    async def __call__(self, extra: EventData | None) -> None:
+        self.calls.append(extra)
+
+
+async def push_all(event_window: EventWindow, events: list[EventData]) -> None:
+    for event in events:
+        await event_window.push(event)
+        await asyncio.sleep(0.005)
+
+
+EVENTS = [{"action_rotation_angle": angle} for angle in (10, 20, -5, 15)]
+
+
+@pytest.mark.parametrize(
+    "mode, expected_calls",
+    [
+        ("throttle", [EVENTS[0], EVENTS[-1]]),
+        ("debounce", [EVENTS[-1]]),
+        ("accumulate", [{"action_rotation_angle": 40}]),
+    ],
+)
+async def test_event_window(mode: str, expected_calls: list[EventData]) -> None:
+    call = FakeCall()
+    event_window = EventWindow(call, mode, WINDOW)
+
+    await push_all(event_window, EVENTS)
+    await asyncio.sleep(WINDOW / 1000 * 3)
+
+    assert call.calls == expected_calls
+
+
+async def test_debounce_waits_for_quiet_window() -> None:
+    call = FakeCall()
+    event_window = EventWindow(call, "debounce", WINDOW)
+
+    for _ in range(4):
+        await event_window.push({"action_step_size": 1})
+        await asyncio.sleep(WINDOW / 1000 / 2)
+    assert call.calls == []
+
+    await asyncio.sleep(WINDOW / 1000 * 2)
+    assert call.calls == [{"action_step_size": 1}]
+
+
+async def test_accumulate_keys() -> None:
+    call = FakeCall()
+    event_window = EventWindow(call, "accumulate", WINDOW, ["value"])
+
+    await push_all(
+        event_window,
+        [
+            {"value": 1, "action_rotation_angle": 10, "other": "a"},
+            {"value": 2, "action_rotation_angle": 20, "other": "b"},
+        ],
+    )
+    await asyncio.sleep(WINDOW / 1000 * 2)
+
+    assert call.calls == [{"value": 3, "action_rotation_angle": 20, "other": "b"}]
+
+
+@pytest.mark.parametrize("with_log", [True, False])
+async def test_failing_call(with_log: bool) -> None:
+    logs: list[tuple[str, tuple[Any, ...]]] = []
+    errors: list[dict[str, Any]] = []
+
+    async def failing_call(extra: EventData | None) -> None:
+        raise ValueError("failing call")
+
+    def log(msg: str, *args: Any, **kwargs: Any) -> None:
+        logs.append((msg, args))
+
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda loop, context: errors.append(context))
+    event_window = EventWindow(
+        failing_call, "debounce", WINDOW, log=log if with_log else None
+    )
+
+    await event_window.push({"action_step_size": 1})
+    await asyncio.sleep(WINDOW / 1000 * 2)
+
+    if with_log:
+        assert len(logs) == 1
+        assert isinstance(logs[0][1][0], ValueError)
+        assert errors == []
+    else:
+        assert [context["message"] for context in errors] == [
+            "Event window call failed"
+        ]
+
+
+def test_invalid_mode() -> None:
+    with wrap_execution(error_expected=True, exception=ValueError):
+        EventWindow(FakeCall(), "fake", WINDOW)
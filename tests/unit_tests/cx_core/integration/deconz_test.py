@@ -70,3 +70,43 @@ async def test_listen_changes(
             "deconz_event",
             **{expected_id: "controller_id"}
         )
+
+
+@pytest.mark.parametrize("listen_to", ["id", "unique_id"])
+async def test_listen_changes_shared_listener(
+    mocker: MockerFixture, listen_to: str
+) -> None:
+    listen_event_mock = mocker.patch.object(Hass, "listen_event")
+    controller_1, controller_2 = Controller(**{}), Controller(**{})
+    handle_action_1 = mocker.patch.object(controller_1, "handle_action")
+    handle_action_2 = mocker.patch.object(controller_2, "handle_action")
+    kwargs = {"listen_to": listen_to, "shared_listener": True}
+    await DeCONZIntegration(controller_1, kwargs).listen_changes("controller_1")
+    await DeCONZIntegration(controller_2, kwargs).listen_changes("controller_2")
+
+    listen_event_mock.assert_called_once()
+    assert listen_event_mock.call_args.args[2] == "deconz_event"
+    callback = listen_event_mock.call_args.args[1]
+
+    data = {listen_to: "controller_2", "event": 1002}
+    await callback("deconz_event", data, {})
+    await callback("deconz_event", {listen_to: "other", "event": 1002}, {})
+
+    handle_action_1.assert_not_called()
+    handle_action_2.assert_called_once_with(1002, extra=data)
+
+
+async def test_listen_changes_shared_listener_per_namespace(
+    mocker: MockerFixture,
+) -> None:
+    listen_event_mock = mocker.patch.object(Hass, "listen_event")
+    controller_1, controller_2 = Controller(**{}), Controller(**{})
+    controller_2.namespace = "hass_2"
+    kwargs = {"shared_listener": True}
+    await DeCONZIntegration(controller_1, kwargs).listen_changes("controller_1")
+    await DeCONZIntegration(controller_2, kwargs).listen_changes("controller_2")
+
+    assert [call.args[0] for call in listen_event_mock.call_args_list] == [
+        controller_1,
+        controller_2,
+    ]
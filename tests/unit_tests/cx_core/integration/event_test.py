@@ -40,6 +40,9 @@ from tests.test_utils import wrap_execution
         ("action_{b}", {"a": 1}, None),
         ("action_{print(1)}", {"a": 1}, None),
         ("action_{1+0}", {"a": 1}, None),
+        ("action_{a[2]}", {"a": [1, 2]}, None),
+        ("action_{a.fake}", {"a": 1}, None),
+        ("action_{a:d}", {"a": "1"}, None),
     ],
 )
 async def test_callback(
@@ -62,7 +65,9 @@ async def test_callback(
     else:
         handle_action_patch.assert_not_called()
         logger_patch.assert_called_once_with(
-            f"Template `{action_template}` could not be rendered with data={data}",
+            "Template `%s` could not be rendered with data=%s",
+            action_template,
+            data,
             level="WARNING",
         )
 
@@ -70,7 +75,31 @@ async def test_callback(
 @pytest.mark.parametrize(
     "kwargs, error_expected",
     [
-        ({"event_type": "homematic.keypress", "controller_key": "device_id"}, False),
+        ({"event_type": "homematic.keypress", "controller_key": "device_id"}, True),
+        (
+            {
+                "event_type": "homematic.keypress",
+                "controller_key": "device_id",
+                "action_template": "{type}_{subtype}",
+            },
+            False,
+        ),
+        (
+            {
+                "event_type": "homematic.keypress",
+                "controller_key": "device_id",
+                "action_template": "action_{a!z}",
+            },
+            True,
+        ),
+        (
+            {
+                "event_type": "homematic.keypress",
+                "controller_key": "device_id",
+                "action_template": "action_{a",
+            },
+            True,
+        ),
         ({"controller_key": "device_id"}, True),
         ({"event_type": "homematic.keypress"}, True),
         ({}, True),
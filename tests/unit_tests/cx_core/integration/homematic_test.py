@@ -7,42 +7,30 @@ from pytest_mock.plugin import MockerFixture
 
 
 @pytest.mark.parametrize(
-    "data, registered_controllers, expected",
+    "data, expected",
     [
         (
             {"name": "MyController", "param": "PRESS_SHORT", "channel": 1},
-            {"MyController"},
             "PRESS_SHORT_1",
         ),
         (
             {"name": "MyController", "param": "PRESS_LONG", "channel": 2},
-            {"MyController"},
             "PRESS_LONG_2",
         ),
-        (
-            {"name": "MyController", "param": "PRESS_LONG", "channel": 2},
-            {"MyController2"},
-            None,
-        ),
     ],
 )
 async def test_callback(
     fake_controller: Controller,
     mocker: MockerFixture,
     data: EventData,
-    registered_controllers: set[str],
-    expected: str | None,
+    expected: str,
 ) -> None:
     handle_action_patch = mocker.patch.object(fake_controller, "handle_action")
     integration = HomematicIntegration(fake_controller, {})
-    integration._registered_controller_ids = registered_controllers
 
     await integration.event_callback("test", data, {})
 
-    if expected is None:
-        handle_action_patch.assert_not_called()
-    else:
-        handle_action_patch.assert_called_once_with(expected, extra=data)
+    handle_action_patch.assert_called_once_with(expected, extra=data)
 
 
 async def test_listen_changes(
@@ -52,11 +40,41 @@ async def test_listen_changes(
     controller_id = "controller_id"
     listen_event_mock = mocker.patch.object(Hass, "listen_event")
     integration = HomematicIntegration(fake_controller, {})
-    assert integration._registered_controller_ids == set()
 
     await integration.listen_changes(controller_id)
 
-    listen_event_mock.assert_called_once_with(
-        fake_controller, integration.event_callback, "homematic.keypress"
-    )
-    assert integration._registered_controller_ids == {controller_id}
+    listen_event_mock.assert_called_once()
+    assert listen_event_mock.call_args.args[0] is fake_controller
+    assert listen_event_mock.call_args.args[2] == "homematic.keypress"
+
+
+async def test_listen_changes_routes_by_name(mocker: MockerFixture) -> None:
+    listen_event_mock = mocker.patch.object(Hass, "listen_event")
+    controllers = [Controller(**{}) for _ in range(3)]
+    handle_action_patches = [
+        mocker.patch.object(controller, "handle_action") for controller in controllers
+    ]
+    for idx, controller in enumerate(controllers):
+        await HomematicIntegration(controller, {}).listen_changes(f"Controller{idx}")
+
+    listen_event_mock.assert_called_once()
+    callback = listen_event_mock.call_args.args[1]
+    data = {"name": "Controller1", "param": "PRESS_SHORT", "channel": 1}
+    await callback("homematic.keypress", data, {})
+
+    handle_action_patches[0].assert_not_called()
+    handle_action_patches[1].assert_called_once_with("PRESS_SHORT_1", extra=data)
+    handle_action_patches[2].assert_not_called()
+
+
+async def test_listen_changes_per_namespace(mocker: MockerFixture) -> None:
+    listen_event_mock = mocker.patch.object(Hass, "listen_event")
+    controllers = [Controller(**{}) for _ in range(3)]
+    controllers[2].namespace = "hass_2"
+    for idx, controller in enumerate(controllers):
+        await HomematicIntegration(controller, {}).listen_changes(f"Controller{idx}")
+
+    assert [call.args[0] for call in listen_event_mock.call_args_list] == [
+        controllers[0],
+        controllers[2],
+    ]
@@ -1,11 +1,13 @@
 from cx_core import integration as integration_module
 from cx_core.controller import Controller
+from pytest_mock import MockerFixture
 
 
 def test_get_integrations(fake_controller: Controller) -> None:
     integrations = integration_module.get_integrations(fake_controller, {})
     inteagration_names = {i.name for i in integrations}
     assert inteagration_names == {
+        "b2m",
         "z2m",
         "zha",
         "deconz",
@@ -18,3 +20,14 @@ def test_get_integrations(fake_controller: Controller) -> None:
         "event",
         "tasmota",
     }
+
+
+def test_get_integration_classes(mocker: MockerFixture) -> None:
+    integration_module.get_integration_classes.cache_clear()
+    get_classes_spy = mocker.spy(integration_module, "get_classes")
+
+    integration_classes = integration_module.get_integration_classes()
+    integration_module.get_integration_classes()
+
+    get_classes_spy.assert_called_once()
+    assert all(cls_.name == name for name, cls_ in integration_classes.items())
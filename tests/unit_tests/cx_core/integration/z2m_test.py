@@ -5,7 +5,7 @@ import pytest
 from appdaemon.plugins.hass.hassapi import Hass
 from appdaemon.plugins.mqtt.mqttapi import Mqtt
 from cx_core.controller import Controller
-from cx_core.integration import EventData
+from cx_core.integration import EventData, z2m
 from cx_core.integration.z2m import Z2MIntegration
 from pytest_mock import MockerFixture
 
@@ -118,3 +118,97 @@ async def test_listen_changes(
         )
     else:
         assert False, "expected_id cannot be other than 'ha' or 'mqtt'"
+
+
+async def test_listen_changes_shared_listener(mocker: MockerFixture) -> None:
+    mqtt_listen_event_mock = mocker.patch.object(Mqtt, "listen_event")
+    controller_1, controller_2 = Controller(**{}), Controller(**{})
+    handle_action_1 = mocker.patch.object(controller_1, "handle_action")
+    handle_action_2 = mocker.patch.object(controller_2, "handle_action")
+    json_loads_spy = mocker.spy(z2m, "json_loads")
+    kwargs = {"listen_to": "mqtt", "shared_listener": True}
+    await Z2MIntegration(controller_1, kwargs).listen_changes("controller_1")
+    await Z2MIntegration(controller_2, kwargs).listen_changes("controller_2")
+
+    mqtt_listen_event_mock.assert_called_once()
+    callback = mqtt_listen_event_mock.call_args.args[1]
+    assert mqtt_listen_event_mock.call_args.kwargs == {"namespace": "mqtt"}
+
+    await callback(
+        "MQTT_MESSAGE",
+        {
+            "topic": "zigbee2mqtt/controller_2",
+            "wildcard": "#",
+            "payload": '{"action": "toggle"}',
+        },
+        {},
+    )
+    await callback(
+        "MQTT_MESSAGE",
+        {"topic": "zigbee2mqtt/other", "payload": '{"action": "toggle"}'},
+        {},
+    )
+
+    handle_action_1.assert_not_called()
+    handle_action_2.assert_called_once_with("toggle", extra={"action": "toggle"})
+    json_loads_spy.assert_called_once()
+
+
+async def test_listen_changes_shared_listener_topic_prefix(
+    mocker: MockerFixture,
+) -> None:
+    mqtt_listen_event_mock = mocker.patch.object(Mqtt, "listen_event")
+    handle_action_mocks = []
+    for topic_prefix in ("zigbee2mqtt", "zigbee2mqtt", "z2m_second"):
+        controller = Controller(**{})
+        handle_action_mocks.append(mocker.patch.object(controller, "handle_action"))
+        kwargs = {
+            "listen_to": "mqtt",
+            "shared_listener": True,
+            "topic_prefix": topic_prefix,
+        }
+        await Z2MIntegration(controller, kwargs).listen_changes("controller")
+
+    assert mqtt_listen_event_mock.call_count == 2
+    for call in mqtt_listen_event_mock.call_args_list:
+        await call.args[1](
+            "MQTT_MESSAGE",
+            {
+                "topic": "z2m_second/controller",
+                "wildcard": "#",
+                "payload": '{"action": "toggle"}',
+            },
+            {},
+        )
+
+    handle_action_mocks[0].assert_not_called()
+    handle_action_mocks[1].assert_not_called()
+    handle_action_mocks[2].assert_called_once_with("toggle", extra={"action": "toggle"})
+
+
+@pytest.mark.parametrize(
+    "payload, action_key, expected_parsed",
+    [
+        ('{"battery": 100, "linkquality": 42}', "action", False),
+        ('{"action_rate": 195}', "action", False),
+        ('{"action": "toggle"}', "action", True),
+        ('{"event": "toggle"}', "event", True),
+        ('{"action": "toggle"}', "event", False),
+        (b'{"action": "toggle"}', "action", True),
+        (b'{"battery": 100}', "action", False),
+    ],
+)
+async def test_event_callback_prefilter(
+    fake_controller: Controller,
+    mocker: MockerFixture,
+    payload: str | bytes,
+    action_key: str,
+    expected_parsed: bool,
+) -> None:
+    mocker.patch.object(fake_controller, "handle_action")
+    json_loads_spy = mocker.spy(z2m, "json_loads")
+    z2m_integration = Z2MIntegration(fake_controller, {"action_key": action_key})
+
+    await z2m_integration.event_callback("test", {"payload": payload}, {})
+
+    assert json_loads_spy.called == expected_parsed
@@ -72,3 +72,44 @@ async def test_listen_changes(
         "zha_event",
         device_ieee=controller_id,
     )
+
+
+async def test_listen_changes_shared_listener(mocker: MockerFixture) -> None:
+    listen_event_mock = mocker.patch.object(Hass, "listen_event")
+    controller_1, controller_2 = Controller(**{}), Controller(**{})
+    handle_action_1 = mocker.patch.object(controller_1, "handle_action")
+    handle_action_2 = mocker.patch.object(controller_2, "handle_action")
+    kwargs = {"shared_listener": True}
+    await ZHAIntegration(controller_1, kwargs).listen_changes("00:11")
+    await ZHAIntegration(controller_2, kwargs).listen_changes("00:22")
+
+    listen_event_mock.assert_called_once()
+    assert listen_event_mock.call_args.args[0] is controller_1
+    assert listen_event_mock.call_args.args[2] == "zha_event"
+    callback = listen_event_mock.call_args.args[1]
+
+    data = {"device_ieee": "00:22", "command": "on", "args": []}
+    await callback("zha_event", data, {})
+    await callback("zha_event", {**data, "device_ieee": "00:33"}, {})
+
+    handle_action_1.assert_not_called()
+    handle_action_2.assert_called_once_with("on", extra=data)
+
+
+async def test_listen_changes_shared_listener_per_namespace(
+    mocker: MockerFixture,
+) -> None:
+    listen_event_mock = mocker.patch.object(Hass, "listen_event")
+    controller_1, controller_2 = Controller(**{}), Controller(**{})
+    controller_2.namespace = "hass_2"
+    handle_action_2 = mocker.patch.object(controller_2, "handle_action")
+    kwargs = {"shared_listener": True}
+    await ZHAIntegration(controller_1, kwargs).listen_changes("00:11")
+    await ZHAIntegration(controller_2, kwargs).listen_changes("00:22")
+
+    assert listen_event_mock.call_count == 2
+    assert listen_event_mock.call_args.args[0] is controller_2
+    data = {"device_ieee": "00:22", "command": "on", "args": []}
+    await listen_event_mock.call_args.args[1]("zha_event", data, {})
+
+    handle_action_2.assert_called_once_with("on", extra=data)
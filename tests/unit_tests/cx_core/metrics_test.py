@@ -0,0 +1,140 @@
+from pathlib import Path
+
+import pytest
+from appdaemon.plugins.hass.hassapi import Hass
+from cx_core.controller import Controller
+from cx_core.metrics import (
+    STAGE_QUEUE,
+    STAGE_SERVICE,
+    STAGE_TOTAL,
+    ActionMetrics,
+    Histogram,
+)
+from pytest_mock import MockerFixture
+
+from tests.test_utils import wrap_execution
+
+
+@pytest.mark.parametrize(
+    "values, percentile, expected_output",
+    [
+        ([], 50, 0),
+        ([0.5, 3, 7, 40], 50, 5),
+        ([0.5, 3, 7, 40], 99, 50),
+        ([0.5] * 99 + [20000], 99, 1),
+        ([20000], 50, 20000),
+        ([0.5, 12000, 30000], 99, 30000),
+    ],
+)
+def test_histogram_percentile(
+    values: list[float], percentile: float, expected_output: float
+) -> None:
+    histogram = Histogram()
+    for value in values:
+        histogram.observe(value)
+    assert histogram.percentile(percentile) == expected_output
+    assert histogram.count == len(values)
+
+
+@pytest.mark.parametrize(
+    "sensor, prometheus_file, error_expected",
+    [
+        ("sensor.metrics", None, False),
+        (None, "metrics.prom", False),
+        (None, None, True),
+    ],
+)
+def test_init(
+    fake_controller: Controller,
+    sensor: str | None,
+    prometheus_file: str | None,
+    error_expected: bool,
+) -> None:
+    with wrap_execution(error_expected=error_expected, exception=ValueError):
+        ActionMetrics(
+            fake_controller, "test", sensor=sensor, prometheus_file=prometheus_file
+        )
+
+
+async def test_observe_without_action(fake_controller: Controller) -> None:
+    metrics = ActionMetrics(fake_controller, "test", sensor="sensor.metrics")
+    metrics.observe(STAGE_SERVICE, 0.01)
+    assert metrics.histograms == {}
+
+
+async def test_action_metrics(
+    fake_controller: Controller, mocker: MockerFixture, tmp_path: Path
+) -> None:
+    set_state_patch = mocker.patch.object(Hass, "set_state", new=mocker.AsyncMock())
+    prometheus_file = tmp_path / "metrics.prom"
+    metrics = ActionMetrics(
+        fake_controller,
+        "livingroom",
+        sensor="sensor.metrics",
+        prometheus_file=str(prometheus_file),
+    )
+
+    metrics.event_received()
+    metrics.action_started("toggle")
+    metrics.observe(STAGE_SERVICE, 0.003)
+    await metrics.action_finished()
+
+    assert set(metrics.histograms) == {
+        ("toggle", STAGE_QUEUE),
+        ("toggle", STAGE_SERVICE),
+        ("toggle", STAGE_TOTAL),
+    }
+    set_state_patch.assert_called_once()
+    assert set_state_patch.call_args.kwargs["state"] == 1
+    attributes = set_state_patch.call_args.kwargs["attributes"]
+    assert attributes["toggle"][STAGE_SERVICE] == {
+        "count": 1,
+        "avg_ms": 3.0,
+        "p50_ms": 5,
+        "p99_ms": 5,
+    }
+    content = prometheus_file.read_text()
+    labels = 'controller="livingroom",action="toggle",stage="service"'
+    assert (
+        f'controllerx_action_stage_duration_seconds_bucket{{{labels},le="0.0025"}} 0'
+        in content
+    )
+    assert (
+        f'controllerx_action_stage_duration_seconds_bucket{{{labels},le="0.005"}} 1'
+        in content
+    )
+    assert f"controllerx_action_stage_duration_seconds_count{{{labels}}} 1" in content
+
+    # The next export waits for the interval
+    metrics.event_received()
+    metrics.action_started("toggle")
+    await metrics.action_finished()
+    set_state_patch.assert_called_once()
+
+
+async def test_action_finished_export_error(
+    fake_controller: Controller, mocker: MockerFixture
+) -> None:
+    mocker.patch.object(
+        Hass, "set_state", new=mocker.AsyncMock(side_effect=RuntimeError("test"))
+    )
+    log_patch = mocker.patch.object(fake_controller, "log")
+    metrics = ActionMetrics(fake_controller, "test", sensor="sensor.metrics")
+
+    metrics.event_received()
+    metrics.action_started("toggle")
+    await metrics.action_finished()
+
+    log_patch.assert_called_once()
+    assert log_patch.call_args.kwargs == {"level": "WARNING"}
+
+
+def test_to_prometheus_escapes_labels(fake_controller: Controller) -> None:
+    metrics = ActionMetrics(fake_controller, 'living"room', prometheus_file="x")
+    metrics.set_event_time(None)
+    metrics.action_started('a\\b"c\nd')
+    metrics.observe(STAGE_SERVICE, 0.003)
+
+    content = metrics.to_prometheus()
+
+    assert 'controller="living\\"room",action="a\\\\b\\"c\\nd"' in content
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any
 
 import pytest
@@ -58,6 +59,31 @@ async def test_hold(
     hold_loop_patch.assert_called_once()
 
 
+async def test_hold_merges_late_steps(
+    sut: FakeReleaseHoldController, mocker: MockerFixture
+) -> None:
+    sut.delay = 10
+    sut.max_loops = 6
+    steps_per_call: list[int] = []
+
+    async def fake_hold_loop(*args: Any) -> bool:
+        steps_per_call.append(sut.hold_loop_steps)
+        if len(steps_per_call) == 1:
+            # The first call takes longer than 2 periods
+            await asyncio.sleep(0.025)
+        return False
+
+    mocker.patch.object(sut, "hold_loop", fake_hold_loop)
+
+    await sut.hold()
+
+    assert steps_per_call[0] == 1
+    assert steps_per_call[1] >= 2
+    assert sum(steps_per_call[:-1]) <= sut.max_loops < sum(steps_per_call)
+    assert sut.hold_loop_steps == 1
+    assert sut.hold_tick_rate is not None
+
+
 @pytest.mark.parametrize(
     "action, on_hold_input, hold_release_toogle, continue_call",
     [
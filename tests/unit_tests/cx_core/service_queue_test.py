@@ -0,0 +1,126 @@
+import asyncio
+from typing import Any
+
+import pytest
+from cx_core.service_queue import ServiceCallQueue, get_service_queue
+from pytest_mock import MockerFixture
+
+
+async def test_call_without_entity(mocker: MockerFixture) -> None:
+    call_stub = mocker.stub()
+
+    async def fake_call(service: str, **attributes: Any) -> str:
+        call_stub(service, **attributes)
+        return "result"
+
+    queue = ServiceCallQueue()
+
+    output = await queue.call(fake_call, "template/render", template="{{ test }}")
+
+    assert output == "result"
+    call_stub.assert_called_once_with("template/render", template="{{ test }}")
+
+
+async def test_call_coalesces_pending_calls() -> None:
+    sent: list[tuple[str, dict[str, Any]]] = []
+    release = asyncio.Event()
+
+    async def fake_call(service: str, **attributes: Any) -> int:
+        sent.append((service, attributes))
+        await release.wait()
+        return len(sent)
+
+    queue = ServiceCallQueue(max_in_flight=1)
+    calls = [
+        queue.call(
+            fake_call, "light/turn_on", entity_id="light.test", brightness=brightness
+        )
+        for brightness in (10, 20, 30)
+    ]
+    calls.append(
+        queue.call(fake_call, "light/turn_on", entity_id="light.other", brightness=5)
+    )
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    await asyncio.sleep(0)
+    release.set()
+
+    outputs = await asyncio.gather(*tasks)
+
+    # The second call gets replaced by the third one before being sent
+    assert outputs[1] is None
+    assert sent == [
+        ("light/turn_on", {"entity_id": "light.test", "brightness": 10}),
+        ("light/turn_on", {"entity_id": "light.other", "brightness": 5}),
+        ("light/turn_on", {"entity_id": "light.test", "brightness": 30}),
+    ]
+
+
+async def test_call_keeps_different_attributes() -> None:
+    sent: list[str] = []
+
+    async def fake_call(service: str, **attributes: Any) -> None:
+        sent.append(service)
+        await asyncio.sleep(0)
+
+    queue = ServiceCallQueue(max_in_flight=1)
+
+    await asyncio.gather(
+        queue.call(fake_call, "light/turn_on", entity_id="light.test", brightness=10),
+        queue.call(fake_call, "light/turn_off", entity_id="light.test"),
+        queue.call(fake_call, "light/turn_on", entity_id="light.test", color_temp=300),
+    )
+
+    assert sent == ["light/turn_on", "light/turn_off", "light/turn_on"]
+
+
+async def test_call_raises_error() -> None:
+    async def fake_call(service: str, **attributes: Any) -> None:
+        raise RuntimeError("test")
+
+    queue = ServiceCallQueue()
+
+    with pytest.raises(RuntimeError):
+        await queue.call(fake_call, "light/turn_on", entity_id="light.test")
+    assert queue._in_flight["light.test"] == 0
+
+
+def test_max_in_flight_error() -> None:
+    with pytest.raises(ValueError):
+        ServiceCallQueue(max_in_flight=0)
+
+
+async def test_call_coalesces_between_controllers() -> None:
+    sent: list[tuple[str, int]] = []
+    release = asyncio.Event()
+
+    def fake_send(controller: str) -> Any:
+        async def send(service: str, **attributes: Any) -> None:
+            sent.append((controller, attributes["brightness"]))
+            await release.wait()
+
+        return send
+
+    queue_1, queue_2 = get_service_queue(), get_service_queue()
+    tasks = [
+        asyncio.ensure_future(
+            queue.call(
+                fake_send(controller),
+                "light/turn_on",
+                entity_id="light.test",
+                brightness=brightness,
+            )
+        )
+        for queue, controller, brightness in (
+            (queue_1, "controller_1", 10),
+            (queue_2, "controller_2", 20),
+            (queue_1, "controller_1", 30),
+        )
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert queue_1 is queue_2
+    assert get_service_queue(2) is not queue_1
+    # The pending call of controller_2 gets replaced by the one of controller_1
+    assert sent == [("controller_1", 10), ("controller_1", 30)]
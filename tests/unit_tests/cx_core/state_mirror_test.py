@@ -0,0 +1,92 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from appdaemon.plugins.hass.hassapi import Hass
+from cx_core.controller import Controller
+from cx_core.state_mirror import StateMirror
+from pytest_mock.plugin import MockerFixture
+
+ENTITY_ID = "light.kitchen"
+FULL_STATE = {
+    "state": "on",
+    "attributes": {"brightness": 100, "supported_color_modes": ["xy"]},
+    "last_changed": "2022-01-01T00:00:00",
+}
+
+
+@pytest.fixture
+def get_state_stub(fake_controller: Controller, mocker: MockerFixture) -> MagicMock:
+    stub = mocker.stub()
+
+    async def fake_get_state(
+        entity_id: str, attribute: str | None = None
+    ) -> dict[str, Any]:
+        stub(entity_id, attribute=attribute)
+        return FULL_STATE
+
+    mocker.patch.object(fake_controller, "get_state", fake_get_state)
+    return stub
+
+
+@pytest.fixture
+def sut(fake_controller: Controller, get_state_stub: MagicMock) -> StateMirror:
+    return StateMirror(fake_controller, max_age=60)
+
+
+@pytest.mark.parametrize(
+    "attribute, expected",
+    [
+        (None, "on"),
+        ("brightness", 100),
+        ("supported_color_modes", ["xy"]),
+        ("last_changed", "2022-01-01T00:00:00"),
+        ("non_existing", None),
+        ("all", FULL_STATE),
+    ],
+)
+async def test_get_state(
+    sut: StateMirror, attribute: str | None, expected: Any
+) -> None:
+    output = await sut.get_state(ENTITY_ID, attribute=attribute)
+    assert output == expected
+
+
+async def test_get_state_reads_once(
+    sut: StateMirror, get_state_stub: MagicMock, mocker: MockerFixture
+) -> None:
+    listen_state_patch = mocker.patch.object(Hass, "listen_state")
+
+    await sut.get_state(ENTITY_ID)
+    await sut.get_state(ENTITY_ID, attribute="brightness")
+    await sut.get_state(ENTITY_ID, attribute="supported_color_modes")
+
+    get_state_stub.assert_called_once_with(ENTITY_ID, attribute="all")
+    listen_state_patch.assert_called_once_with(
+        sut.controller, sut.state_callback, ENTITY_ID, attribute="all"
+    )
+
+
+async def test_state_callback(sut: StateMirror, get_state_stub: MagicMock) -> None:
+    assert await sut.get_state(ENTITY_ID, attribute="brightness") == 100
+
+    await sut.state_callback(
+        ENTITY_ID,
+        "all",
+        FULL_STATE,
+        {"state": "on", "attributes": {"brightness": 200}},
+        {},
+    )
+
+    assert await sut.get_state(ENTITY_ID, attribute="brightness") == 200
+    get_state_stub.assert_called_once()
+
+
+async def test_get_state_stale(sut: StateMirror, get_state_stub: MagicMock) -> None:
+    sut.max_age = 0
+    sut._states[ENTITY_ID] = (0, {"state": "off", "attributes": {}})
+
+    output = await sut.get_state(ENTITY_ID)
+
+    assert output == "on"
+    get_state_stub.assert_called_once()
@@ -1,6 +1,7 @@
 import pytest
 from cx_const import Number, StepperDir
 from cx_core.stepper import MinMax, Stepper, StepperOutput
+from cx_core.stepper.stop_stepper import StopStepper
 
 
 class FakeStepper(Stepper):
@@ -63,3 +64,23 @@ def test_apply_sign(
     stepper = FakeStepper()
     value_output = stepper.apply_sign(value, direction_input)
     assert value_output == expected_value
+
+
+@pytest.mark.parametrize(
+    "value, steps, expected_value, expected_direction",
+    [
+        (0, 1, 10, StepperDir.UP),
+        (0, 3, 30, StepperDir.UP),
+        (90, 3, 100, None),
+        (100, 2, 100, None),
+    ],
+)
+def test_step_many(
+    value: Number, steps: int, expected_value: Number, expected_direction: str | None
+) -> None:
+    stepper = StopStepper(MinMax(0, 100), 10)
+
+    stepper_output = stepper.step_many(value, StepperDir.UP, steps)
+
+    assert stepper_output.next_value == expected_value
+    assert stepper_output.next_direction == expected_direction
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, Literal
 
 import pytest
@@ -7,10 +8,9 @@ from cx_core.controller import Controller
 from cx_core.feature_support.light import LightSupport
 from cx_core.stepper import MinMax, Stepper
 from cx_core.stepper.bounce_stepper import BounceStepper
-from cx_core.stepper.index_loop_stepper import IndexLoopStepper
 from cx_core.stepper.loop_stepper import LoopStepper
 from cx_core.stepper.stop_stepper import StopStepper
-from cx_core.type.light_controller import ColorMode, LightEntity
+from cx_core.type.light_controller import ColorMode, LightEntity, PredictedValues
 from pytest import MonkeyPatch
 from pytest_mock.plugin import MockerFixture
 
@@ -216,7 +216,7 @@ async def test_get_value_attribute(
             BounceStepper,
             False,
         ),
-        (LightController.ATTRIBUTE_XY_COLOR, StepperMode.STOP, IndexLoopStepper, False),
+        (LightController.ATTRIBUTE_XY_COLOR, StepperMode.STOP, LoopStepper, False),
         (
             LightController.ATTRIBUTE_BRIGHTNESS,
             "this-stepper-mode-does-not-exist",
@@ -355,6 +355,84 @@ async def test_call_light_service(
     )
 
 
+@pytest.mark.parametrize(
+    "service, expected_parallel",
+    [
+        ("light/turn_on", True),
+        ("light/turn_off", True),
+        ("light/toggle", False),
+    ],
+)
+async def test_call_light_service_group_fanout(
+    sut: LightController,
+    mocker: MockerFixture,
+    service: str,
+    expected_parallel: bool,
+) -> None:
+    members = [f"light.member_{idx}" for idx in range(5)]
+    called_entities: list[str] = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_call_service(
+        service: str, entity_id: str, **attributes: Any
+    ) -> None:
+        nonlocal in_flight, max_in_flight
+        called_entities.append(entity_id)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    mocker.patch.object(sut, "call_service", fake_call_service)
+    sut.entity = LightEntity(name="light.group", entities=members)
+    sut.remove_transition_check = True
+    sut.group_fanout_semaphore = asyncio.Semaphore(2)
+
+    await sut.call_light_service(service)
+
+    if expected_parallel:
+        assert sorted(called_entities) == members
+        assert max_in_flight == 2
+    else:
+        assert called_entities == ["light.group"]
+
+
+async def test_predicted_values(sut: LightController, mocker: MockerFixture) -> None:
+    get_entity_state_stub = mocker.stub()
+
+    async def fake_get_entity_state(*args: Any, **kwargs: Any) -> int:
+        get_entity_state_stub(*args, **kwargs)
+        return 10
+
+    mocker.patch.object(sut, "get_entity_state", fake_get_entity_state)
+    mocker.patch.object(sut, "call_service")
+    sut.predicted_values = PredictedValues(margin=60)
+    sut.transition = 300
+    sut.remove_transition_check = False
+
+    await sut.call_light_service("light/turn_on", brightness=200, transition=0.3)
+    assert await sut.get_predicted_entity_state() == "on"
+    assert await sut.get_predicted_entity_state("brightness") == 200
+    assert await sut.get_predicted_entity_state("color_temp") == 10
+
+    await sut.call_light_service("light/turn_off")
+    assert await sut.get_predicted_entity_state() == "off"
+    assert await sut.get_predicted_entity_state("brightness") == 10
+
+    await sut.call_light_service("light/toggle")
+    assert await sut.get_predicted_entity_state() == 10
+    assert get_entity_state_stub.call_count == 3
+
+
+async def test_predicted_values_expire() -> None:
+    predicted_values = PredictedValues(margin=0)
+    predicted_values.set("brightness", 200, transition=-1)
+    assert predicted_values.get("brightness") is None
+    predicted_values.set("brightness", 200, transition=60)
+    assert predicted_values.get("brightness") == 200
+
+
 @pytest.mark.parametrize(
     "add_transition, add_transition_turn_toggle, on_from_user, transition_support, expected_remove_transition_check",
     [
@@ -443,7 +521,7 @@ async def test_toggle_full(
 
     call_service_patch.assert_called_once_with(
         "light/toggle",
-        **{"entity_id": ENTITY_NAME, attribute: expected_attribute_value}
+        **{"entity_id": ENTITY_NAME, attribute: expected_attribute_value},
     )
 
 
@@ -469,7 +547,7 @@ async def test_toggle_min(
 
     call_service_patch.assert_called_once_with(
         "light/toggle",
-        **{"entity_id": ENTITY_NAME, attribute: expected_attribute_value}
+        **{"entity_id": ENTITY_NAME, attribute: expected_attribute_value},
     )
 
 
@@ -559,7 +637,7 @@ async def test_sync(
     called_service_patch.assert_called_once_with(
         "light/turn_on",
         entity_id=ENTITY_NAME,
-        **{"transition": 0.3, **expected_attributes}
+        **{"transition": 0.3, **expected_attributes},
     )
 
 
@@ -779,6 +857,83 @@ async def test_hold(
         )
 
 
+@pytest.mark.parametrize(
+    "attribute, mode, expected_ramp",
+    [
+        (LightController.ATTRIBUTE_BRIGHTNESS, StepperMode.STOP, True),
+        (LightController.ATTRIBUTE_COLOR_TEMP, StepperMode.STOP, True),
+        (LightController.ATTRIBUTE_BRIGHTNESS, StepperMode.BOUNCE, False),
+        (LightController.ATTRIBUTE_XY_COLOR, StepperMode.STOP, False),
+    ],
+)
+async def test_hold_mode_ramp(
+    sut: LightController,
+    mocker: MockerFixture,
+    attribute: str,
+    mode: str,
+    expected_ramp: bool,
+) -> None:
+    sut.hold_mode = "ramp"
+    mocker.patch.object(sut, "before_action", fake_fn(True, async_=True))
+    mocker.patch.object(sut, "get_attribute", fake_fn(attribute, async_=True))
+    mocker.patch.object(sut, "get_value_attribute", fake_fn(10, async_=True))
+    sut.smooth_power_on_check = False
+    sut.remove_transition_check = False
+    hold_ramp_patch = mocker.patch.object(sut, "hold_ramp")
+    super_hold_patch = mocker.patch.object(ReleaseHoldController, "hold")
+
+    await sut.hold(attribute, StepperDir.UP, mode=mode)
+
+    assert hold_ramp_patch.called == expected_ramp
+    assert super_hold_patch.called != expected_ramp
+
+
+@pytest.mark.parametrize(
+    "release, delay, expected_transition",
+    [
+        (True, 100, 3.5),
+        (False, 1, 0.035),
+    ],
+)
+async def test_hold_ramp(
+    sut: LightController,
+    mocker: MockerFixture,
+    release: bool,
+    delay: int,
+    expected_transition: float,
+) -> None:
+    sut.delay = delay
+    sut.value_attribute = 220
+    sut.remove_transition_check = False
+    sut.feature_support._supported_features = 0
+    call_service_patch = mocker.patch.object(sut, "call_service")
+    # 35 steps of 1 to reach the max brightness
+    stepper = StopStepper(MinMax(1, 255), 254)
+
+    task = asyncio.ensure_future(
+        sut.hold_ramp(LightController.ATTRIBUTE_BRIGHTNESS, StepperDir.UP, stepper)
+    )
+    await asyncio.sleep(0.2)
+    assert sut.on_hold == release
+    if release:
+        sut.release_hold()
+    await task
+
+    calls = [call.kwargs for call in call_service_patch.call_args_list]
+    assert calls[0]["brightness"] == 255
+    assert calls[0]["transition"] == pytest.approx(expected_transition)
+    if release:
+        assert len(calls) == 2
+        assert calls[1]["transition"] == 0
+        assert 221 <= calls[1]["brightness"] <= 225
+        assert sut.value_attribute == calls[1]["brightness"]
+    else:
+        assert len(calls) == 1
+        assert sut.value_attribute == 255
+    assert not sut.on_hold
+    assert sut.ramp is None
+
+
 @pytest.mark.parametrize("value_attribute", [10, None])
 async def test_hold_loop(
     sut: LightController, mocker: MockerFixture, value_attribute: int | None
@@ -800,4 +955,5 @@ async def test_hold_loop(
             direction,
             stepper,
             extra_attributes={"transition": sut.delay / 1000},
+            steps=1,
         )
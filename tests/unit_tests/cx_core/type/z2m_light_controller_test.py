@@ -0,0 +1,165 @@
+import json
+from typing import Any
+
+import pytest
+from appdaemon.adapi import ADAPI
+from appdaemon.plugins.mqtt.mqttapi import Mqtt
+from cx_core import Controller, Z2MLightController
+from cx_core.metrics import STAGE_PUBLISH_MQTT, ActionMetrics, _current_action
+from cx_core.type.z2m_light_controller import Z2MLightEntity
+from pytest_mock.plugin import MockerFixture
+
+from tests.test_utils import fake_fn
+
+DEVICES = ["bulb_1", "bulb_2", "bulb_3"]
+
+
+@pytest.mark.parametrize(
+    "devices, groups, expected_targets",
+    [
+        (None, {}, ["livingroom"]),
+        (DEVICES, {}, DEVICES),
+        (DEVICES, {"other": ["bulb_1"]}, DEVICES),
+        (DEVICES, {"other": ["bulb_1"], "group": list(reversed(DEVICES))}, ["group"]),
+    ],
+)
+def test_get_targets(
+    devices: list[str] | None,
+    groups: dict[str, list[str]],
+    expected_targets: list[str],
+) -> None:
+    entity = Z2MLightEntity("livingroom", devices=devices, groups=groups)
+    assert entity.get_targets() == expected_targets
+
+
+@pytest.mark.parametrize(
+    "targets, expected_topics",
+    [
+        (None, ["zigbee2mqtt/livingroom/set"]),
+        (["group"], ["zigbee2mqtt/group/set"]),
+        (DEVICES, [f"zigbee2mqtt/{device}/set" for device in DEVICES]),
+    ],
+)
+async def test_mqtt_call(
+    mocker: MockerFixture,
+    targets: list[str] | None,
+    expected_topics: list[str],
+) -> None:
+    sut = Z2MLightController(**{})
+    sut.entity = Z2MLightEntity("livingroom", devices=DEVICES, mode="mqtt")
+    sut.targets = targets
+    published: list[tuple[str, str]] = []
+
+    async def fake_publish(topic: str, payload: str) -> None:
+        published.append((topic, payload))
+
+    sut._mqtt_fn = {"mqtt": fake_publish}
+
+    await sut._mqtt_call({"state": "ON"})
+
+    assert sorted(topic for topic, _ in published) == sorted(expected_topics)
+    assert all(payload == '{"state": "ON"}' for _, payload in published)
+
+
+async def test_bridge_callbacks(mocker: MockerFixture) -> None:
+    sut = Z2MLightController(**{})
+    mocker.patch.object(sut, "log", fake_fn())
+    sut.entity = Z2MLightEntity("livingroom", devices=DEVICES, mode="mqtt")
+    sut.targets = sut.entity.get_targets()
+    devices_payload: list[dict[str, Any]] = [
+        {"ieee_address": f"0x{idx}", "friendly_name": device}
+        for idx, device in enumerate(DEVICES)
+    ]
+    groups_payload: list[dict[str, Any]] = [
+        {"friendly_name": "partial", "members": [{"ieee_address": "0x0"}]},
+        {
+            "friendly_name": "livingroom_group",
+            "members": [{"ieee_address": f"0x{idx}"} for idx in range(3)],
+        },
+    ]
+
+    await sut.bridge_groups_callback(
+        "MQTT_MESSAGE", {"payload": json.dumps(groups_payload)}, {}
+    )
+    # Groups cannot be matched until the devices are known
+    assert sut.targets == DEVICES
+
+    await sut.bridge_devices_callback(
+        "MQTT_MESSAGE", {"payload": json.dumps(devices_payload)}, {}
+    )
+    assert sut.targets == ["livingroom_group"]
+    assert sut.entity.groups["partial"] == ["bulb_1"]
+
+
+async def test_bridge_groups_removed(mocker: MockerFixture) -> None:
+    sut = Z2MLightController(**{})
+    mocker.patch.object(sut, "log", fake_fn())
+    sut.entity = Z2MLightEntity(
+        "livingroom",
+        devices=DEVICES,
+        mode="mqtt",
+        groups={"config_group": ["bulb_1"]},
+    )
+    sut.bridge_devices = {f"0x{idx}": device for idx, device in enumerate(DEVICES)}
+    group_payload = {
+        "friendly_name": "livingroom_group",
+        "members": [{"ieee_address": f"0x{idx}"} for idx in range(3)],
+    }
+
+    await sut.bridge_groups_callback(
+        "MQTT_MESSAGE", {"payload": json.dumps([group_payload])}, {}
+    )
+    assert sut.targets == ["livingroom_group"]
+
+    await sut.bridge_groups_callback("MQTT_MESSAGE", {"payload": "[]"}, {})
+    assert sut.targets == DEVICES
+    assert sut.entity.groups == {"config_group": ["bulb_1"]}
+
+
+@pytest.mark.parametrize(
+    "mode, namespace_exists, expected_mode",
+    [
+        ("auto", True, "mqtt"),
+        ("auto", False, "ha"),
+        ("ha", True, "ha"),
+        ("mqtt", False, "mqtt"),
+    ],
+)
+async def test_init_mode(
+    mocker: MockerFixture, mode: str, namespace_exists: bool, expected_mode: str
+) -> None:
+    sut = Z2MLightController(**{})
+    mocker.patch.object(Controller, "init")
+    mocker.patch.object(ADAPI, "namespace_exists", fake_fn(namespace_exists, True))
+    sut.args = {"light": {"name": "livingroom", "mode": mode}}
+
+    await sut.init()
+
+    assert sut.entity.mode == expected_mode
+
+
+async def test_init_listens_to_bridge(mocker: MockerFixture) -> None:
+    sut = Z2MLightController(**{})
+    mocker.patch.object(Controller, "init")
+    listen_event_mock = mocker.patch.object(Mqtt, "listen_event")
+    sut.args = {"light": {"name": "livingroom", "devices": DEVICES, "mode": "mqtt"}}
+
+    await sut.init()
+
+    assert sut.targets == DEVICES
+    assert [call.kwargs["topic"] for call in listen_event_mock.call_args_list] == [
+        "zigbee2mqtt/bridge/devices",
+        "zigbee2mqtt/bridge/groups",
+    ]
+
+
+async def test_mqtt_call_metrics(mocker: MockerFixture) -> None:
+    sut = Z2MLightController(**{})
+    sut.entity = Z2MLightEntity("livingroom", mode="mqtt")
+    sut._mqtt_fn = {"mqtt": fake_fn(async_=True)}
+    sut.metrics = ActionMetrics(sut, "test", sensor="sensor.metrics")
+    _current_action.set("toggle")
+
+    await sut._mqtt_call({"state": "TOGGLE"})
+
+    assert sut.metrics.histograms[("toggle", STAGE_PUBLISH_MQTT)].count == 1
@@ -166,3 +166,39 @@ async def test_get_entity_state(
             stub_get_state.call_count == 2
             stub_get_state.assert_any_call(entity_input, attribute="entity_id")
             stub_get_state.assert_any_call("entity.test", attribute="attribute_test")
+
+
+@pytest.mark.parametrize(
+    "entity_input, expected_mirror_calls, expected_get_state_calls",
+    [
+        ("entity.test", 1, 0),
+        ("{{ states('input_text.entity') }}", 0, 1),
+    ],
+)
+async def test_get_entity_state_with_state_mirror(
+    sut_before_init: MyTypeController,
+    mocker: MockerFixture,
+    entity_input: str,
+    expected_mirror_calls: int,
+    expected_get_state_calls: int,
+) -> None:
+    sut_before_init.args["state_mirror"] = True
+    await sut_before_init.init()
+    assert sut_before_init.state_mirror is not None
+    mirror_get_state = mocker.patch.object(
+        sut_before_init.state_mirror, "get_state", return_value="on"
+    )
+    get_state_stub = mocker.stub()
+
+    async def fake_get_state(entity: str, attribute: str | None = None) -> str:
+        get_state_stub(entity, attribute=attribute)
+        return "on"
+
+    mocker.patch.object(sut_before_init, "get_state", fake_get_state)
+    sut_before_init.entity = MyEntity(entity_input)
+
+    output = await sut_before_init.get_entity_state(attribute="attribute_test")
+
+    assert output == "on"
+    assert mirror_get_state.call_count == expected_mirror_calls
+    assert get_state_stub.call_count == expected_get_state_calls
@@ -4,6 +4,7 @@ import cx_devices as devices_module
 import pytest
 from cx_const import ActionEvent, DefaultActionsMapping
 from cx_core import Controller, ReleaseHoldController
+from cx_devices.index import DEVICES_INDEX
 from cx_helper import get_classes
 
 from tests.test_utils import get_controller
@@ -73,3 +74,11 @@ def test_devices(device_class: type[Controller]) -> None:
     for func in integration_mappings_funcs:
         mappings = func()
         check_mapping(mappings, possible_actions, device)
+
+
+def test_devices_index() -> None:
+    devices_index = {
+        device_class.__name__: device_class.__module__.split(".", 1)[1]
+        for device_class in devices_classes
+    }
+    assert DEVICES_INDEX == devices_index, "`cx_devices/index.py` is outdated"